@@ -0,0 +1,87 @@
+"""Native UUID primary and foreign keys
+
+Revision ID: 002_native_uuid_keys
+Revises: 001_initial
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_native_uuid_keys'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referenced table) for every foreign key touched by the type change.
+FOREIGN_KEYS = [
+    ('knowledge_entries', 'person_id', 'persons'),
+    ('conversations', 'user_id', 'users'),
+    ('conversations', 'person_id', 'persons'),
+    ('messages', 'conversation_id', 'conversations'),
+]
+
+KEY_COLUMNS = [
+    ('users', 'id'),
+    ('persons', 'id'),
+    ('knowledge_entries', 'id'),
+    ('knowledge_entries', 'person_id'),
+    ('conversations', 'id'),
+    ('conversations', 'user_id'),
+    ('conversations', 'person_id'),
+    ('messages', 'id'),
+    ('messages', 'conversation_id'),
+]
+
+
+def _drop_foreign_keys() -> None:
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+
+def _create_foreign_keys() -> None:
+    for table, column, referenced in FOREIGN_KEYS:
+        op.create_foreign_key(
+            f'{table}_{column}_fkey',
+            table,
+            referenced,
+            [column],
+            ['id'],
+            ondelete='CASCADE',
+        )
+
+
+def upgrade() -> None:
+    """Convert String(36) keys to native 16-byte UUID columns."""
+    _drop_foreign_keys()
+    for table, column in KEY_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.UUID(as_uuid=True),
+            existing_type=sa.String(36),
+            existing_nullable=False,
+            postgresql_using=f'{column}::uuid',
+        )
+    _create_foreign_keys()
+
+
+def downgrade() -> None:
+    """Revert native UUID keys to String(36)."""
+    _drop_foreign_keys()
+    for table, column in KEY_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(36),
+            existing_type=postgresql.UUID(as_uuid=True),
+            existing_nullable=False,
+            postgresql_using=f'{column}::text',
+        )
+    _create_foreign_keys()
@@ -0,0 +1,60 @@
+"""Timezone-aware server-side timestamps
+
+Revision ID: 003_timestamptz
+Revises: 002_native_uuid_keys
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_timestamptz'
+down_revision: Union[str, None] = '002_native_uuid_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('persons', 'created_at'),
+    ('persons', 'updated_at'),
+    ('knowledge_entries', 'created_at'),
+    ('knowledge_entries', 'updated_at'),
+    ('conversations', 'created_at'),
+    ('conversations', 'updated_at'),
+    ('messages', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    """Store timestamps as timestamptz defaulting to the transaction time."""
+    for table, column in TIMESTAMP_COLUMNS:
+        # Existing rows were written with naive datetime.utcnow() values.
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+            server_default=sa.func.now(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+
+def downgrade() -> None:
+    """Revert timestamps to naive UTC columns."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=False,
+            server_default=sa.text('CURRENT_TIMESTAMP'),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
@@ -0,0 +1,32 @@
+"""Composite index for top-k knowledge retrieval
+
+Revision ID: 004_knowledge_priority_index
+Revises: 003_timestamptz
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_knowledge_priority_index'
+down_revision: Union[str, None] = '003_timestamptz'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index knowledge entries by person, priority and recency."""
+    op.create_index(
+        'ix_knowledge_entries_person_priority_created',
+        'knowledge_entries',
+        ['person_id', sa.text('priority DESC'), sa.text('created_at DESC')],
+    )
+
+
+def downgrade() -> None:
+    """Drop the top-k knowledge index."""
+    op.drop_index('ix_knowledge_entries_person_priority_created', table_name='knowledge_entries')
@@ -0,0 +1,55 @@
+"""JSONB metadata columns
+
+Revision ID: 005_jsonb_metadata
+Revises: 004_knowledge_priority_index
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_jsonb_metadata'
+down_revision: Union[str, None] = '004_knowledge_priority_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+METADATA_TABLES = ['persons', 'knowledge_entries', 'conversations', 'messages']
+
+
+def upgrade() -> None:
+    """Store metadata as JSONB and index knowledge metadata for containment queries."""
+    for table in METADATA_TABLES:
+        op.alter_column(
+            table,
+            'metadata',
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using='metadata::jsonb',
+        )
+    op.create_index(
+        'ix_knowledge_entries_metadata_gin',
+        'knowledge_entries',
+        ['metadata'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Revert metadata columns to JSON."""
+    op.drop_index('ix_knowledge_entries_metadata_gin', table_name='knowledge_entries')
+    for table in METADATA_TABLES:
+        op.alter_column(
+            table,
+            'metadata',
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using='metadata::json',
+        )
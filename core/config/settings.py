@@ -80,6 +80,10 @@ class Settings(BaseSettings):
     pinecone_api_key: str = ""
     pinecone_environment: str = ""
     pinecone_index_name: str = ""
+    pinecone_pool_threads: int = 30
+    pinecone_upsert_batch_size: int = 64
+    pinecone_document_chunk_size: int = 1000
+    pinecone_compress_text: bool = False
     
     # Security (optional for simple mode)
     secret_key: str = ""
@@ -100,6 +104,16 @@ class Settings(BaseSettings):
     # Embeddings (Local / Free)
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_dimensions: int = 384
+    embedding_batch_size: int = 64
+    embedding_backend: Literal["torch", "onnx"] = "torch"
+    embedding_onnx_cache_dir: str = ".cache/embedding-onnx"
+    embedding_quantize: bool = True
+    embedding_device: str = "auto"
+    embedding_precision: Literal["fp16", "bf16", "fp32"] = "fp16"
+    embedding_cpu_threads: int = 8
+    query_embed_cache_size: int = 1024
+    query_embed_batch_size: int = 32
+    query_embed_batch_wait_ms: float = 5.0
     retrieval_top_k: int = 5
     retrieval_score_threshold: float = 0.2
     retrieval_chunk_size: int = 1000
@@ -33,6 +33,16 @@ class LLMError(PersonXException):
     pass
 
 
+class RetriableLLMError(LLMError):
+    """LLM API call failed transiently (transport error, 429, or 5xx)."""
+    pass
+
+
+class PermanentLLMError(LLMError):
+    """LLM API call failed in a way retrying cannot fix (e.g. 400/401/404)."""
+    pass
+
+
 class AuthenticationError(PersonXException):
     """Authentication failed."""
     pass
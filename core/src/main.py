@@ -1,12 +1,14 @@
 """
 Main FastAPI application.
 """
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager
 import logging
 
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from config.settings import get_settings
 from src.core.exceptions import (
@@ -32,6 +34,10 @@ from src.models.schemas import (
     RetrievalIndexResponse,
     RetrievalSearchRequest,
     RetrievalSearchResponse,
+    RetrievalBatchSearchRequest,
+    RetrievalBatchSearchResponse,
+    RetrievalIndexAndSearchRequest,
+    RetrievalIndexAndSearchResponse,
     RetrievedDocument,
     RetrievalSourceDeleteRequest,
     RetrievalSourceReplaceRequest,
@@ -39,9 +45,10 @@ from src.models.schemas import (
 )
 from src.services.prompt_builder import (
     build_prompt,
-    collect_knowledge_inputs,
+    collect_knowledge_inputs_async,
     build_persona_system_prompt,
 )
+from src.services.gemini_client import close_client as close_gemini_client
 from src.services.llm_service import generate_with_retry
 from src.services.vector_store import VectorStoreService
 from src.services.person_service import (
@@ -79,6 +86,39 @@ def get_vector_store_service() -> VectorStoreService:
     return _vector_store_service
 
 
+VectorStoreProvider = Callable[[], VectorStoreService]
+LLMGenerator = Callable[[str], Awaitable[str]]
+
+
+def get_vector_store_provider() -> VectorStoreProvider:
+    """
+    Dependency returning the lazy vector store accessor.
+    Construction is deferred so chat without retrieval never touches Pinecone and
+    configuration errors are mapped inside each endpoint.
+    """
+    return get_vector_store_service
+
+
+def get_llm_generator() -> LLMGenerator:
+    """Dependency returning the LLM completion function used by chat."""
+    return generate_with_retry
+
+
+def _to_retrieved_documents(matches: list[dict]) -> list[RetrievedDocument]:
+    """Map vector store matches to the API retrieval schema."""
+    return [
+        RetrievedDocument(
+            id=match.get("id", ""),
+            score=float(match.get("score", 0.0)),
+            source=match.get("source"),
+            content=match.get("text", ""),
+            retrieval_mode=match.get("retrieval_mode"),
+            metadata=match.get("metadata", {}),
+        )
+        for match in matches
+    ]
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -93,6 +133,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    await close_gemini_client()
     logger.info("Application shutdown complete")
 
 
@@ -119,81 +160,90 @@ app.add_middleware(
 # Exception Handlers
 # ============================================================================
 
+def _error_response(status_code: int, error: ErrorResponse) -> Response:
+    """Render an error body with Pydantic's JSON serializer instead of json.dumps."""
+    return Response(
+        content=error.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 @app.exception_handler(NotFoundError)
 async def not_found_handler(request: Request, exc: NotFoundError):
     """Handle NotFoundError exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_404_NOT_FOUND,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_404_NOT_FOUND,
+        ErrorResponse(
             error="not_found",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
 @app.exception_handler(ValidationError)
 async def validation_error_handler(request: Request, exc: ValidationError):
     """Handle ValidationError exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        ErrorResponse(
             error="validation_error",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
 @app.exception_handler(AuthenticationError)
 async def authentication_error_handler(request: Request, exc: AuthenticationError):
     """Handle AuthenticationError exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_401_UNAUTHORIZED,
+        ErrorResponse(
             error="authentication_error",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
 @app.exception_handler(AuthorizationError)
 async def authorization_error_handler(request: Request, exc: AuthorizationError):
     """Handle AuthorizationError exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_403_FORBIDDEN,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_403_FORBIDDEN,
+        ErrorResponse(
             error="authorization_error",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
 @app.exception_handler(RateLimitError)
 async def rate_limit_error_handler(request: Request, exc: RateLimitError):
     """Handle RateLimitError exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_429_TOO_MANY_REQUESTS,
+        ErrorResponse(
             error="rate_limit_error",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
 @app.exception_handler(PersonXException)
 async def personx_exception_handler(request: Request, exc: PersonXException):
     """Handle all other PersonX exceptions."""
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        ErrorResponse(
             error="internal_error",
             message=exc.message,
             details=exc.details,
-        ).model_dump(mode="json"),
+        ),
     )
 
 
@@ -201,13 +251,13 @@ async def personx_exception_handler(request: Request, exc: PersonXException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
+    return _error_response(
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        ErrorResponse(
             error="internal_error",
             message="An unexpected error occurred",
             details={"error": str(exc)} if settings.debug else {},
-        ).model_dump(mode="json"),
+        ),
     )
 
 
@@ -285,7 +335,11 @@ async def list_knowledge_endpoint(person_id: str):
 
 
 @app.post("/v1/chat", response_model=ChatResponse, tags=["Chat"])
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+    generate: LLMGenerator = Depends(get_llm_generator),
+):
     """
     Simple Gemini-only chat endpoint.
     No database or authentication required.
@@ -294,7 +348,9 @@ async def chat(request: ChatRequest):
     if request.use_retrieval:
         top_k = request.retrieval_top_k or settings.retrieval_top_k
         try:
-            retrieved_docs = get_vector_store_service().search(
+            # Search runs in the threadpool so concurrent queries can share one encode batch.
+            retrieved_docs = await run_in_threadpool(
+                vector_store().search,
                 person_id=request.person_id,
                 query=request.message,
                 top_k=top_k,
@@ -329,7 +385,7 @@ async def chat(request: ChatRequest):
         knowledge_count = len(person_knowledge)
         auto_knowledge_context = render_knowledge_context(request.person_id, max_entries=10)
 
-    inline_knowledge_inputs = collect_knowledge_inputs(
+    inline_knowledge_inputs = await collect_knowledge_inputs_async(
         knowledge_text=request.knowledge_text,
         knowledge_files=request.knowledge_files,
     )
@@ -346,7 +402,7 @@ async def chat(request: ChatRequest):
         retrieved_context=retrieved_docs,
     )
 
-    response_text = await generate_with_retry(prompt)
+    response_text = await generate(prompt)
 
     conversation = ensure_conversation(
         person_id=request.person_id,
@@ -390,11 +446,14 @@ async def chat(request: ChatRequest):
 
 
 @app.post("/v1/retrieval/index", response_model=RetrievalIndexResponse, tags=["Retrieval"])
-async def retrieval_index(request: RetrievalIndexRequest):
+async def retrieval_index(
+    request: RetrievalIndexRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
     """
     Index knowledge text/files into Pinecone for a given person.
     """
-    documents = collect_knowledge_inputs(
+    documents = await collect_knowledge_inputs_async(
         knowledge_text=request.knowledge_text,
         knowledge_files=request.knowledge_files,
     )
@@ -406,7 +465,8 @@ async def retrieval_index(request: RetrievalIndexRequest):
         )
 
     try:
-        indexed_chunks = get_vector_store_service().upsert_documents(
+        indexed_chunks = await run_in_threadpool(
+            vector_store().upsert_documents,
             person_id=request.person_id,
             documents=documents,
             source=request.source,
@@ -424,13 +484,73 @@ async def retrieval_index(request: RetrievalIndexRequest):
     )
 
 
+@app.post(
+    "/v1/retrieval/index_and_search",
+    response_model=RetrievalIndexAndSearchResponse,
+    tags=["Retrieval"],
+)
+async def retrieval_index_and_search(
+    request: RetrievalIndexAndSearchRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
+    """
+    Index knowledge for a person and immediately search it in one round trip.
+    """
+    documents = await collect_knowledge_inputs_async(
+        knowledge_text=request.knowledge_text,
+        knowledge_files=request.knowledge_files,
+    )
+
+    if not documents:
+        raise ValidationError(
+            message="No knowledge content available for indexing",
+            details={"person_id": request.person_id},
+        )
+
+    def index_then_search() -> tuple[int, list[dict]]:
+        store = vector_store()
+        indexed = store.upsert_documents(
+            person_id=request.person_id,
+            documents=documents,
+            source=request.source,
+        )
+        return indexed, store.search(
+            person_id=request.person_id,
+            query=request.query,
+            top_k=request.top_k,
+            min_score=request.min_score,
+            enable_hybrid_fallback=True,
+        )
+
+    try:
+        # Embedding and Pinecone upserts block, so both steps run off the event loop.
+        indexed_chunks, matches = await run_in_threadpool(index_then_search)
+    except ConfigurationError as exc:
+        raise ValidationError(
+            message="Retrieval indexing requested but vector store is not configured",
+            details={"error": exc.message},
+        ) from exc
+
+    return RetrievalIndexAndSearchResponse(
+        person_id=request.person_id,
+        indexed_chunks=indexed_chunks,
+        source=request.source,
+        query=request.query,
+        results=_to_retrieved_documents(matches),
+    )
+
+
 @app.post("/v1/retrieval/search", response_model=RetrievalSearchResponse, tags=["Retrieval"])
-async def retrieval_search(request: RetrievalSearchRequest):
+async def retrieval_search(
+    request: RetrievalSearchRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
     """
     Search person-scoped knowledge from Pinecone.
     """
     try:
-        matches = get_vector_store_service().search(
+        matches = await run_in_threadpool(
+            vector_store().search,
             person_id=request.person_id,
             query=request.query,
             top_k=request.top_k,
@@ -443,22 +563,50 @@ async def retrieval_search(request: RetrievalSearchRequest):
             details={"error": exc.message},
         ) from exc
 
-    results = [
-        RetrievedDocument(
-            id=match.get("id", ""),
-            score=float(match.get("score", 0.0)),
-            source=match.get("source"),
-            content=match.get("text", ""),
-            retrieval_mode=match.get("retrieval_mode"),
-            metadata=match.get("metadata", {}),
-        )
-        for match in matches
-    ]
-
     return RetrievalSearchResponse(
         person_id=request.person_id,
         query=request.query,
-        results=results,
+        results=_to_retrieved_documents(matches),
+    )
+
+
+@app.post(
+    "/v1/retrieval/search/batch",
+    response_model=RetrievalBatchSearchResponse,
+    tags=["Retrieval"],
+)
+async def retrieval_search_batch(
+    request: RetrievalBatchSearchRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
+    """
+    Run several person-scoped searches in one request.
+    """
+    try:
+        batch_matches = await run_in_threadpool(
+            vector_store().search_batch,
+            person_id=request.person_id,
+            queries=request.queries,
+            top_k=request.top_k,
+            min_score=request.min_score,
+            enable_hybrid_fallback=True,
+        )
+    except ConfigurationError as exc:
+        raise ValidationError(
+            message="Retrieval search requested but vector store is not configured",
+            details={"error": exc.message},
+        ) from exc
+
+    return RetrievalBatchSearchResponse(
+        person_id=request.person_id,
+        results=[
+            RetrievalSearchResponse(
+                person_id=request.person_id,
+                query=query,
+                results=_to_retrieved_documents(matches),
+            )
+            for query, matches in zip(request.queries, batch_matches)
+        ],
     )
 
 
@@ -467,12 +615,16 @@ async def retrieval_search(request: RetrievalSearchRequest):
     response_model=RetrievalSourceActionResponse,
     tags=["Retrieval"],
 )
-async def retrieval_delete_source(request: RetrievalSourceDeleteRequest):
+async def retrieval_delete_source(
+    request: RetrievalSourceDeleteRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
     """
     Delete all indexed chunks for a person/source pair.
     """
     try:
-        deleted = get_vector_store_service().delete_by_source(
+        deleted = await run_in_threadpool(
+            vector_store().delete_by_source,
             person_id=request.person_id,
             source=request.source,
         )
@@ -495,17 +647,21 @@ async def retrieval_delete_source(request: RetrievalSourceDeleteRequest):
     response_model=RetrievalSourceActionResponse,
     tags=["Retrieval"],
 )
-async def retrieval_replace_source(request: RetrievalSourceReplaceRequest):
+async def retrieval_replace_source(
+    request: RetrievalSourceReplaceRequest,
+    vector_store: VectorStoreProvider = Depends(get_vector_store_provider),
+):
     """
     Replace all indexed chunks for a person/source pair.
     """
-    documents = collect_knowledge_inputs(
+    documents = await collect_knowledge_inputs_async(
         knowledge_text=request.knowledge_text,
         knowledge_files=request.knowledge_files,
     )
 
     try:
-        deleted, indexed = get_vector_store_service().replace_source_documents(
+        deleted, indexed = await run_in_threadpool(
+            vector_store().replace_source_documents,
             person_id=request.person_id,
             source=request.source,
             documents=documents,
@@ -1,6 +1,8 @@
 """
 SQLAlchemy models for database tables.
 """
+import os
+import time
 import uuid
 from datetime import datetime
 from typing import Optional
@@ -10,19 +12,32 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     JSON,
+    func,
 )
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
 
 
-def generate_uuid() -> str:
-    """Generate a UUID string."""
-    return str(uuid.uuid4())
+def generate_uuid() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7.
+    The leading millisecond timestamp keeps primary key inserts on the rightmost B-tree page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= ((rand >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
 
 
 class User(Base):
@@ -30,16 +45,20 @@ class User(Base):
     
     __tablename__ = "users"
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=generate_uuid
+    )
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     username: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     full_name: Mapped[Optional[str]] = mapped_column(String(255))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     
     # Relationships
@@ -59,7 +78,9 @@ class Person(Base):
     
     __tablename__ = "persons"
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=generate_uuid
+    )
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     role: Mapped[Optional[str]] = mapped_column(String(255))
     department: Mapped[Optional[str]] = mapped_column(String(255))
@@ -72,11 +93,13 @@ class Person(Base):
     
     # Metadata
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    profile_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
+    profile_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSONB)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     
     # Relationships
@@ -99,9 +122,11 @@ class KnowledgeEntry(Base):
     
     __tablename__ = "knowledge_entries"
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
-    person_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("persons.id", ondelete="CASCADE"), nullable=False, index=True
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=generate_uuid
+    )
+    person_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("persons.id", ondelete="CASCADE"), nullable=False, index=True
     )
     
     # Content
@@ -114,15 +139,17 @@ class KnowledgeEntry(Base):
     source_reference: Mapped[Optional[str]] = mapped_column(String(500))  # file path, URL, etc.
     
     # Metadata
-    entry_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
+    entry_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSONB)
     tags: Mapped[Optional[list]] = mapped_column(JSON)
     
     # Importance/priority
     priority: Mapped[int] = mapped_column(Integer, default=5)  # 1-10 scale
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     
     # Relationships
@@ -132,17 +159,34 @@ class KnowledgeEntry(Base):
         return f"<KnowledgeEntry {self.id} for Person {self.person_id}>"
 
 
+# Serves top-k "priority, then recency" lookups per person with a single index scan.
+Index(
+    "ix_knowledge_entries_person_priority_created",
+    KnowledgeEntry.person_id,
+    KnowledgeEntry.priority.desc(),
+    KnowledgeEntry.created_at.desc(),
+)
+# Supports containment filters (metadata @> '{...}') on knowledge metadata.
+Index(
+    "ix_knowledge_entries_metadata_gin",
+    KnowledgeEntry.entry_metadata,
+    postgresql_using="gin",
+)
+
+
 class Conversation(Base):
     """A conversation session between a user and a person's AI assistant."""
     
     __tablename__ = "conversations"
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
-    user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=generate_uuid
     )
-    person_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("persons.id", ondelete="CASCADE"), nullable=False, index=True
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    person_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("persons.id", ondelete="CASCADE"), nullable=False, index=True
     )
     
     # Conversation details
@@ -153,11 +197,13 @@ class Conversation(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # Metadata
-    context_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
+    context_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSONB)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     
     # Relationships
@@ -176,9 +222,14 @@ class Message(Base):
     
     __tablename__ = "messages"
     
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=generate_uuid)
-    conversation_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=generate_uuid
+    )
+    conversation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     
     # Message details
@@ -193,9 +244,11 @@ class Message(Base):
     confidence_score: Mapped[Optional[float]] = mapped_column(Float)
     
     # Metadata
-    message_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
+    message_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSONB)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     
     # Relationships
     conversation: Mapped["Conversation"] = relationship("Conversation", back_populates="messages")
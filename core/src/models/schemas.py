@@ -2,9 +2,18 @@
 Pydantic schemas for API request/response validation.
 """
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Annotated, Any, Optional
+from uuid import UUID
 
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    model_validator,
+)
 
 
 def utc_now() -> datetime:
@@ -12,11 +21,25 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _uuid_to_str(value: Any) -> Any:
+    """Serialize native UUID primary/foreign keys from ORM rows as strings."""
+    return str(value) if isinstance(value, UUID) else value
+
+
+IdStr = Annotated[str, BeforeValidator(_uuid_to_str)]
+
+
+class APIModel(BaseModel):
+    """Base for API schemas: instances are immutable once validated."""
+
+    model_config = ConfigDict(frozen=True)
+
+
 # ============================================================================
 # Health Check Schemas
 # ============================================================================
 
-class HealthResponse(BaseModel):
+class HealthResponse(APIModel):
     """Health check response."""
     status: str = Field(..., description="Service status")
     environment: str = Field(..., description="Environment (dev/staging/prod)")
@@ -29,7 +52,7 @@ class HealthResponse(BaseModel):
 # User Schemas
 # ============================================================================
 
-class UserBase(BaseModel):
+class UserBase(APIModel):
     """Base user schema."""
     email: str = Field(..., max_length=255)
     username: str = Field(..., min_length=3, max_length=100)
@@ -43,7 +66,7 @@ class UserCreate(UserBase):
 
 class UserResponse(UserBase):
     """Schema for user response."""
-    id: str
+    id: IdStr
     is_active: bool
     is_admin: bool
     created_at: datetime
@@ -56,7 +79,7 @@ class UserResponse(UserBase):
 # Person Schemas
 # ============================================================================
 
-class PersonBase(BaseModel):
+class PersonBase(APIModel):
     """Base person schema."""
     name: str = Field(..., min_length=1, max_length=255)
     role: Optional[str] = Field(None, max_length=255)
@@ -76,7 +99,7 @@ class PersonCreate(PersonBase):
     metadata: Optional[dict] = Field(None, description="Additional metadata")
 
 
-class PersonUpdate(BaseModel):
+class PersonUpdate(APIModel):
     """Schema for updating a person."""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     role: Optional[str] = Field(None, max_length=255)
@@ -89,7 +112,7 @@ class PersonUpdate(BaseModel):
 
 class PersonResponse(PersonBase):
     """Schema for person response."""
-    id: str
+    id: IdStr
     base_system_prompt: Optional[str]
     communication_style: Optional[dict]
     is_active: bool
@@ -107,7 +130,7 @@ class PersonResponse(PersonBase):
 # Knowledge Entry Schemas
 # ============================================================================
 
-class KnowledgeEntryBase(BaseModel):
+class KnowledgeEntryBase(APIModel):
     """Base knowledge entry schema."""
     content: str = Field(..., min_length=1)
     title: Optional[str] = Field(None, max_length=500)
@@ -130,7 +153,7 @@ class KnowledgeEntryCreate(KnowledgeEntryBase):
     metadata: Optional[dict] = Field(None, description="Additional metadata")
 
 
-class KnowledgeEntryUpdate(BaseModel):
+class KnowledgeEntryUpdate(APIModel):
     """Schema for updating a knowledge entry."""
     content: Optional[str] = Field(None, min_length=1)
     title: Optional[str] = Field(None, max_length=500)
@@ -144,8 +167,8 @@ class KnowledgeEntryUpdate(BaseModel):
 
 class KnowledgeEntryResponse(KnowledgeEntryBase):
     """Schema for knowledge entry response."""
-    id: str
-    person_id: str
+    id: IdStr
+    person_id: IdStr
     metadata: Optional[dict] = Field(
         default=None,
         validation_alias=AliasChoices("metadata", "entry_metadata"),
@@ -153,14 +176,14 @@ class KnowledgeEntryResponse(KnowledgeEntryBase):
     created_at: datetime
     updated_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
 
 
 # ============================================================================
 # Conversation Schemas
 # ============================================================================
 
-class ConversationBase(BaseModel):
+class ConversationBase(APIModel):
     """Base conversation schema."""
     title: Optional[str] = Field(None, max_length=500)
 
@@ -172,9 +195,9 @@ class ConversationCreate(ConversationBase):
 
 class ConversationResponse(ConversationBase):
     """Schema for conversation response."""
-    id: str
-    user_id: str
-    person_id: str
+    id: IdStr
+    user_id: IdStr
+    person_id: IdStr
     is_active: bool
     summary: Optional[str]
     metadata: Optional[dict] = Field(
@@ -184,14 +207,14 @@ class ConversationResponse(ConversationBase):
     created_at: datetime
     updated_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
 
 
 # ============================================================================
 # Message Schemas
 # ============================================================================
 
-class MessageBase(BaseModel):
+class MessageBase(APIModel):
     """Base message schema."""
     role: str = Field(..., pattern="^(user|assistant|system)$")
     content: str = Field(..., min_length=1)
@@ -204,8 +227,8 @@ class MessageCreate(MessageBase):
 
 class MessageResponse(MessageBase):
     """Schema for message response."""
-    id: str
-    conversation_id: str
+    id: IdStr
+    conversation_id: IdStr
     model: Optional[str]
     tokens_used: Optional[int]
     confidence_score: Optional[float]
@@ -215,17 +238,19 @@ class MessageResponse(MessageBase):
     )
     created_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra="forbid")
 
 
 # ============================================================================
 # Chat Schemas (For Step 5)
 # ============================================================================
 
-class ChatRequest(BaseModel):
+class ChatRequest(APIModel):
     """Schema for chat request."""
     person_id: str = Field(..., description="ID of the person to chat with")
-    message: str = Field(..., min_length=1, description="User's message")
+    message: Annotated[str, StringConstraints(strip_whitespace=True)] = Field(
+        ..., min_length=1, description="User's message"
+    )
     conversation_id: Optional[str] = Field(
         None,
         description="Existing conversation ID (create new if not provided)"
@@ -256,17 +281,9 @@ class ChatRequest(BaseModel):
         le=20,
         description="Optional top-k override for retrieval results"
     )
-    
-    @field_validator("message")
-    @classmethod
-    def message_not_empty(cls, v: str) -> str:
-        """Ensure message is not just whitespace."""
-        if not v.strip():
-            raise ValueError("Message cannot be empty or whitespace only")
-        return v.strip()
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(APIModel):
     """Schema for chat response."""
     response: str = Field(..., description="AI assistant's response")
     conversation_id: str = Field(..., description="Conversation ID")
@@ -281,7 +298,7 @@ class ChatResponse(BaseModel):
 # Retrieval Schemas
 # ============================================================================
 
-class RetrievalIndexRequest(BaseModel):
+class RetrievalIndexRequest(APIModel):
     """Schema for indexing knowledge into the vector store."""
     person_id: str = Field(..., description="ID of the person to index knowledge for")
     source: str = Field("manual", description="Source label for indexed content")
@@ -301,14 +318,14 @@ class RetrievalIndexRequest(BaseModel):
         return self
 
 
-class RetrievalIndexResponse(BaseModel):
+class RetrievalIndexResponse(APIModel):
     """Schema for retrieval indexing response."""
     person_id: str = Field(..., description="Person ID")
     indexed_chunks: int = Field(..., description="Number of chunks indexed")
     source: str = Field(..., description="Source label used for indexing")
 
 
-class RetrievalSearchRequest(BaseModel):
+class RetrievalSearchRequest(APIModel):
     """Schema for retrieval search requests."""
     person_id: str = Field(..., description="ID of the person to search for")
     query: str = Field(..., min_length=1, description="Search query")
@@ -321,7 +338,7 @@ class RetrievalSearchRequest(BaseModel):
     )
 
 
-class RetrievedDocument(BaseModel):
+class RetrievedDocument(APIModel):
     """Schema for an individual retrieval match."""
     id: str = Field(..., description="Vector ID")
     score: float = Field(..., description="Similarity score")
@@ -334,20 +351,65 @@ class RetrievedDocument(BaseModel):
     metadata: dict = Field(default_factory=dict, description="Additional metadata")
 
 
-class RetrievalSearchResponse(BaseModel):
+class RetrievalSearchResponse(APIModel):
     """Schema for retrieval search responses."""
     person_id: str = Field(..., description="Person ID")
     query: str = Field(..., description="Search query")
     results: list[RetrievedDocument] = Field(default_factory=list)
 
 
-class RetrievalSourceDeleteRequest(BaseModel):
+class RetrievalBatchSearchRequest(APIModel):
+    """Schema for running several retrieval searches in one request."""
+    person_id: str = Field(..., description="ID of the person to search for")
+    queries: list[Annotated[str, Field(min_length=1)]] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Search queries",
+    )
+    top_k: int = Field(5, ge=1, le=20, description="Maximum number of matches per query")
+    min_score: float = Field(
+        0.0,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity score threshold"
+    )
+
+
+class RetrievalBatchSearchResponse(APIModel):
+    """Schema for batch retrieval search responses, one entry per query."""
+    person_id: str = Field(..., description="Person ID")
+    results: list[RetrievalSearchResponse] = Field(default_factory=list)
+
+
+class RetrievalIndexAndSearchRequest(RetrievalIndexRequest):
+    """Schema for indexing knowledge and searching it in one request."""
+    query: str = Field(..., min_length=1, description="Search query run after indexing")
+    top_k: int = Field(5, ge=1, le=20, description="Maximum number of matches")
+    min_score: float = Field(
+        0.0,
+        ge=0.0,
+        le=1.0,
+        description="Minimum similarity score threshold"
+    )
+
+
+class RetrievalIndexAndSearchResponse(APIModel):
+    """Schema for combined index and search responses."""
+    person_id: str = Field(..., description="Person ID")
+    indexed_chunks: int = Field(..., description="Number of chunks indexed")
+    source: str = Field(..., description="Source label used for indexing")
+    query: str = Field(..., description="Search query")
+    results: list[RetrievedDocument] = Field(default_factory=list)
+
+
+class RetrievalSourceDeleteRequest(APIModel):
     """Delete all indexed chunks for a person/source pair."""
     person_id: str = Field(..., description="Person ID")
     source: str = Field(..., min_length=1, description="Source label")
 
 
-class RetrievalSourceReplaceRequest(BaseModel):
+class RetrievalSourceReplaceRequest(APIModel):
     """Replace all chunks for a person/source pair."""
     person_id: str = Field(..., description="Person ID")
     source: str = Field(..., min_length=1, description="Source label")
@@ -367,7 +429,7 @@ class RetrievalSourceReplaceRequest(BaseModel):
         return self
 
 
-class RetrievalSourceActionResponse(BaseModel):
+class RetrievalSourceActionResponse(APIModel):
     """Response for source delete/replace actions."""
     person_id: str = Field(..., description="Person ID")
     source: str = Field(..., description="Source label")
@@ -379,7 +441,7 @@ class RetrievalSourceActionResponse(BaseModel):
 # Error Schemas
 # ============================================================================
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(APIModel):
     """Schema for error responses."""
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
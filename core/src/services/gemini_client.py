@@ -2,9 +2,36 @@
 Minimal Gemini client using the REST API.
 """
 import httpx
+import orjson
 
 from config.settings import get_settings
-from src.core.exceptions import ConfigurationError, LLMError
+from src.core.exceptions import (
+    ConfigurationError,
+    LLMError,
+    PermanentLLMError,
+    RetriableLLMError,
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared Gemini HTTP client so keep-alive connections are reused."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared Gemini HTTP client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 async def generate_text(prompt: str) -> str:
@@ -33,13 +60,27 @@ async def generate_text(prompt: str) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(url, params=params, json=payload)
-            response.raise_for_status()
-    except httpx.HTTPError as exc:
-        raise LLMError("Gemini API call failed", {"error": str(exc)}) from exc
+        response = await get_client().post(
+            url,
+            params=params,
+            content=orjson.dumps(payload),
+            headers={"content-type": "application/json"},
+        )
+    except httpx.TransportError as exc:
+        raise RetriableLLMError("Gemini API call failed", {"error": str(exc)}) from exc
+
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetriableLLMError(
+            "Gemini API call failed",
+            {"status_code": response.status_code, "error": response.text},
+        )
+    if response.is_error:
+        raise PermanentLLMError(
+            "Gemini API call failed",
+            {"status_code": response.status_code, "error": response.text},
+        )
 
-    data = response.json()
+    data = orjson.loads(response.content)
     candidates = data.get("candidates", [])
     if not candidates:
         raise LLMError("Gemini returned no candidates", {"response": data})
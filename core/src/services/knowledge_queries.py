@@ -0,0 +1,24 @@
+"""SQL query builders for database-backed knowledge retrieval."""
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import raiseload
+
+from src.models.database import KnowledgeEntry
+
+
+def select_top_knowledge(person_id: uuid.UUID | str, k: int) -> Select[tuple[KnowledgeEntry]]:
+    """
+    Select a person's top-k knowledge entries by priority, then recency.
+    ORDER BY + LIMIT run in PostgreSQL on the (person_id, priority, created_at) index,
+    so only k rows cross the database boundary.
+    """
+    return (
+        select(KnowledgeEntry)
+        .where(KnowledgeEntry.person_id == person_id)
+        .order_by(KnowledgeEntry.priority.desc(), KnowledgeEntry.created_at.desc())
+        .limit(k)
+        .options(raiseload("*"))
+    )
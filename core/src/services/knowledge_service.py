@@ -1,7 +1,10 @@
 """In-memory knowledge entry service for MVP persona chat."""
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from uuid import uuid4
 
 from src.core.exceptions import NotFoundError
@@ -17,12 +20,18 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-_KNOWLEDGE: dict[str, list[KnowledgeEntryResponse]] = {}
+# person_id -> knowledge_id -> entry. Dicts keep insertion order, so iterating in
+# reverse yields newest-first without sorting; updates keep their original slot.
+_KNOWLEDGE: dict[str, dict[str, KnowledgeEntryResponse]] = {}
+# Bumped on every write so rendered context can be memoized per person.
+_KNOWLEDGE_VERSION: dict[str, int] = defaultdict(int)
 
 
 def reset_knowledge_store() -> None:
     """Reset in-memory knowledge store (used by tests)."""
     _KNOWLEDGE.clear()
+    _KNOWLEDGE_VERSION.clear()
+    _render_knowledge_context.cache_clear()
 
 
 def add_knowledge_entry(person_id: str, payload: KnowledgeEntryCreate) -> KnowledgeEntryResponse:
@@ -44,14 +53,14 @@ def add_knowledge_entry(person_id: str, payload: KnowledgeEntryCreate) -> Knowle
         created_at=now,
         updated_at=now,
     )
-    _KNOWLEDGE.setdefault(person_id, []).append(entry)
+    _KNOWLEDGE.setdefault(person_id, {})[entry.id] = entry
+    _KNOWLEDGE_VERSION[person_id] += 1
     return entry
 
 
 def list_knowledge_entries(person_id: str) -> list[KnowledgeEntryResponse]:
     get_person(person_id)
-    entries = _KNOWLEDGE.get(person_id, [])
-    return sorted(entries, key=lambda entry: entry.created_at, reverse=True)
+    return list(reversed(_KNOWLEDGE.get(person_id, {}).values()))
 
 
 def update_knowledge_entry(
@@ -59,35 +68,40 @@ def update_knowledge_entry(
     knowledge_id: str,
     payload: KnowledgeEntryUpdate,
 ) -> KnowledgeEntryResponse:
-    entries = _KNOWLEDGE.get(person_id, [])
-    for idx, entry in enumerate(entries):
-        if entry.id != knowledge_id:
-            continue
-        updates = payload.model_dump(exclude_unset=True)
-        if not updates:
-            return entry
-        data = entry.model_dump()
-        data.update(updates)
-        data["updated_at"] = _utc_now()
-        updated = KnowledgeEntryResponse(**data)
-        entries[idx] = updated
-        return updated
-
-    raise NotFoundError(
-        message=f"Knowledge entry not found: {knowledge_id}",
-        details={"person_id": person_id, "knowledge_id": knowledge_id},
-    )
+    entries = _KNOWLEDGE.get(person_id, {})
+    entry = entries.get(knowledge_id)
+    if entry is None:
+        raise NotFoundError(
+            message=f"Knowledge entry not found: {knowledge_id}",
+            details={"person_id": person_id, "knowledge_id": knowledge_id},
+        )
+
+    updates = payload.model_dump(exclude_unset=True)
+    if not updates:
+        return entry
+    data = entry.model_dump()
+    data.update(updates)
+    data["updated_at"] = _utc_now()
+    updated = KnowledgeEntryResponse(**data)
+    entries[knowledge_id] = updated
+    _KNOWLEDGE_VERSION[person_id] += 1
+    return updated
 
 
 def render_knowledge_context(person_id: str, max_entries: int = 10) -> str:
     """Render recent knowledge entries as prompt-ready context text."""
-    entries = _KNOWLEDGE.get(person_id, [])
+    return _render_knowledge_context(person_id, max_entries, _KNOWLEDGE_VERSION.get(person_id, 0))
+
+
+@lru_cache(maxsize=256)
+def _render_knowledge_context(person_id: str, max_entries: int, version: int) -> str:
+    # ``version`` is only part of the cache key; a write bumps it and misses the cache.
+    entries = _KNOWLEDGE.get(person_id, {})
     if not entries:
         return ""
 
-    selected = sorted(entries, key=lambda entry: entry.created_at, reverse=True)[:max_entries]
     sections: list[str] = []
-    for entry in selected:
+    for entry in islice(reversed(entries.values()), max_entries):
         header = entry.title or f"Knowledge ({entry.source_type})"
         source = entry.source_reference or entry.source_type
         sections.append(f"[{header} | source: {source}]")
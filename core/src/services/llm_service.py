@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import asyncio
+import random
 
-from src.core.exceptions import LLMError
+from src.core.exceptions import LLMError, RetriableLLMError
 from src.services.gemini_client import generate_text
 
 
@@ -11,8 +12,12 @@ async def generate_with_retry(
     prompt: str,
     max_attempts: int = 3,
     retry_delay_seconds: float = 0.5,
+    max_retry_delay_seconds: float = 8.0,
 ) -> str:
-    """Generate text with bounded retries for transient failures."""
+    """
+    Generate text with bounded retries for transient failures.
+    Only RetriableLLMError is retried, using capped exponential backoff with jitter.
+    """
     if max_attempts < 1:
         raise ValueError("max_attempts must be >= 1")
 
@@ -20,16 +25,19 @@ async def generate_with_retry(
     for attempt in range(1, max_attempts + 1):
         try:
             return await generate_text(prompt)
-        except Exception as exc:  # noqa: BLE001
+        except RetriableLLMError as exc:
             last_error = exc
             if attempt >= max_attempts:
-                if isinstance(exc, LLMError):
-                    raise
-                raise LLMError(
-                    message="LLM generation failed after retries",
-                    details={"attempts": attempt, "error": str(exc)},
-                ) from exc
-            await asyncio.sleep(retry_delay_seconds * attempt)
+                raise
+            delay = min(max_retry_delay_seconds, retry_delay_seconds * 2 ** (attempt - 1))
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+        except LLMError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise LLMError(
+                message="LLM generation failed",
+                details={"attempts": attempt, "error": str(exc)},
+            ) from exc
 
     # Unreachable, but keeps the type-checker honest.
     raise LLMError(
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from src.models.database import Conversation, Message
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 class ConversationMemory:
@@ -15,7 +15,7 @@ class ConversationMemory:
         
         messages = self.db.query(Message).filter(
             Message.conversation_id == conversation_id
-        ).order_by(Message.timestamp.desc()).limit(self.max_messages).all()
+        ).order_by(Message.created_at.desc()).limit(self.max_messages).all()
         
         return [
             {"role": msg.role, "content": msg.content}
@@ -32,20 +32,20 @@ class ConversationMemory:
         
         # Create conversation if new
         if not conversation_id:
-            conv = Conversation(
-                created_at=datetime.utcnow(),
-                last_updated=datetime.utcnow()
-            )
+            # created_at/updated_at come from the timestamptz server defaults.
+            conv = Conversation()
             self.db.add(conv)
             self.db.flush()
             conversation_id = str(conv.id)
         
+        # One server now() would give both messages the same transaction timestamp, so
+        # stamp them client-side (timezone-aware) to keep question before answer.
         # Save question
         self.db.add(Message(
             conversation_id=conversation_id,
             role="user",
             content=question,
-            timestamp=datetime.utcnow()
+            created_at=datetime.now(timezone.utc)
         ))
         
         # Save answer
@@ -53,7 +53,7 @@ class ConversationMemory:
             conversation_id=conversation_id,
             role="assistant",
             content=answer,
-            timestamp=datetime.utcnow()
+            created_at=datetime.now(timezone.utc)
         ))
         
         self.db.commit()
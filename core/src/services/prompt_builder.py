@@ -2,33 +2,78 @@
 Simple prompt builder for Gemini-only mode.
 Combines system prompt, person identity, knowledge, and user message.
 """
+import asyncio
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from config.prompts import PERSONA_SYSTEM_PROMPT_TEMPLATE
 
+_REPO_ROOT: Path = Path(__file__).resolve().parents[2]
+
+_SECTION_SEPARATOR = "\n\n"
+_REPLY_STYLE_SECTION = (
+    "Reply Style:\n"
+    "- Respond like a human teammate in natural language.\n"
+    "- Do not include internal reasoning, analysis traces, or policy labels.\n"
+    "- Do not echo section headers from context unless the user asks for structured format.\n"
+    "- If information is missing, say what is missing in plain language and suggest next checks."
+)
 
-def read_knowledge_files(file_paths: list[str] | None) -> list[str]:
-    if not file_paths:
-        return []
 
-    repo_root = Path(__file__).resolve().parents[2]
-    contents: list[str] = []
+def _resolve_knowledge_paths(file_paths: list[str]) -> list[Path]:
+    """Validate knowledge file paths and resolve them inside the repo root."""
+    resolved: list[Path] = []
 
     for path_str in file_paths:
         path = Path(path_str)
         if not path.is_absolute():
-            path = (repo_root / path).resolve()
+            path = (_REPO_ROOT / path).resolve()
 
-        if repo_root not in path.parents and path != repo_root:
+        if _REPO_ROOT not in path.parents and path != _REPO_ROOT:
             raise ValueError(f"Knowledge file path not allowed: {path_str}")
 
         if not path.exists() or not path.is_file():
             raise ValueError(f"Knowledge file not found: {path_str}")
 
-        contents.append(path.read_text(encoding="utf-8", errors="replace"))
+        resolved.append(path)
+
+    return resolved
+
+
+@lru_cache(maxsize=256)
+def _read_knowledge_file_cached(path: str, mtime_ns: int, size: int) -> str:
+    # mtime/size are part of the cache key so edited files are re-read automatically.
+    return Path(path).read_text(encoding="utf-8", errors="replace")
+
+
+def _read_knowledge_file(path: Path) -> str:
+    stat = path.stat()
+    return _read_knowledge_file_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def read_knowledge_files(file_paths: list[str] | None) -> list[str]:
+    if not file_paths:
+        return []
+
+    return [_read_knowledge_file(path) for path in _resolve_knowledge_paths(file_paths)]
+
 
-    return contents
+async def read_knowledge_files_async(file_paths: list[str] | None) -> list[str]:
+    """Read knowledge files concurrently in worker threads without blocking the event loop."""
+    if not file_paths:
+        return []
+
+    paths = _resolve_knowledge_paths(file_paths)
+    return list(
+        await asyncio.gather(*(asyncio.to_thread(_read_knowledge_file, path) for path in paths))
+    )
+
+
+def _inline_knowledge(knowledge_text: str | None) -> list[str]:
+    if knowledge_text and knowledge_text.strip():
+        return [knowledge_text.strip()]
+    return []
 
 
 def collect_knowledge_inputs(
@@ -36,13 +81,21 @@ def collect_knowledge_inputs(
     knowledge_files: list[str] | None = None,
 ) -> list[str]:
     """Collect inline knowledge and file-based knowledge into one list."""
-    parts: list[str] = []
-    if knowledge_text and knowledge_text.strip():
-        parts.append(knowledge_text.strip())
+    parts = _inline_knowledge(knowledge_text)
     parts.extend(read_knowledge_files(knowledge_files))
     return parts
 
 
+async def collect_knowledge_inputs_async(
+    knowledge_text: str | None = None,
+    knowledge_files: list[str] | None = None,
+) -> list[str]:
+    """Async variant of collect_knowledge_inputs for request handlers."""
+    parts = _inline_knowledge(knowledge_text)
+    parts.extend(await read_knowledge_files_async(knowledge_files))
+    return parts
+
+
 def format_retrieved_context(retrieved_context: list[dict[str, Any]] | None) -> str:
     """Format retrieved chunks into a readable context block."""
     if not retrieved_context:
@@ -79,36 +132,35 @@ def build_prompt(
     knowledge_files: list[str] | None = None,
     retrieved_context: list[dict[str, Any]] | None = None,
 ) -> str:
+    # Every section is emitted as (header, body, separator) fragments and joined once.
     parts: list[str] = []
 
     if system_prompt:
-        parts.append(f"System Prompt:\n{system_prompt.strip()}")
+        parts.extend(("System Prompt:\n", system_prompt.strip(), _SECTION_SEPARATOR))
 
     if person_identity:
-        parts.append(f"Person Identity:\n{person_identity.strip()}")
+        parts.extend(("Person Identity:\n", person_identity.strip(), _SECTION_SEPARATOR))
 
     knowledge_parts = collect_knowledge_inputs(
         knowledge_text=knowledge_text,
         knowledge_files=knowledge_files,
     )
     if knowledge_parts:
-        parts.append("Knowledge:\n" + "\n\n".join(knowledge_parts))
+        parts.append("Knowledge:\n")
+        for index, knowledge in enumerate(knowledge_parts):
+            if index:
+                parts.append(_SECTION_SEPARATOR)
+            parts.append(knowledge)
+        parts.append(_SECTION_SEPARATOR)
 
     retrieval_block = format_retrieved_context(retrieved_context)
     if retrieval_block:
-        parts.append("Retrieved Context:\n" + retrieval_block)
-
-    parts.append(
-        "Reply Style:\n"
-        "- Respond like a human teammate in natural language.\n"
-        "- Do not include internal reasoning, analysis traces, or policy labels.\n"
-        "- Do not echo section headers from context unless the user asks for structured format.\n"
-        "- If information is missing, say what is missing in plain language and suggest next checks."
-    )
+        parts.extend(("Retrieved Context:\n", retrieval_block, _SECTION_SEPARATOR))
 
-    parts.append(f"User Message:\n{user_message.strip()}")
+    parts.extend((_REPLY_STYLE_SECTION, _SECTION_SEPARATOR))
+    parts.extend(("User Message:\n", user_message.strip()))
 
-    return "\n\n".join(parts).strip()
+    return "".join(parts)
 
 
 def build_persona_system_prompt(
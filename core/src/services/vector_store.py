@@ -3,17 +3,180 @@ Pinecone-backed vector store service for retrieval.
 """
 from __future__ import annotations
 
+import base64
+import hashlib
+import heapq
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
 from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
-from config.settings import get_settings
+import numpy as np
+
+from config.settings import Settings, get_settings
 from src.core.exceptions import ConfigurationError
 
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_VECTOR_ID_BYTES = 16
+
+# Pinecone metadata key holding zlib+base64 chunk text when text compression is enabled.
+_PACKED_TEXT_KEY = "text_z"
+
+# Dynamic int8 ONNX export, written under the ONNX cache directory.
+_QUANTIZATION_CONFIG = "avx512_vnni"
+_QUANTIZED_ONNX_FILE = f"onnx/model_qint8_{_QUANTIZATION_CONFIG}.onnx"
+_ONNX_MODEL_FILE = "onnx/model.onnx"
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _tokenize(text: str) -> frozenset[str]:
+    """Lower-cased word tokens used for keyword fallback matching."""
+    return frozenset(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def _pack_text(text: str) -> str:
+    """Compress chunk text for Pinecone metadata."""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def _unpack_text(packed: str) -> str:
+    """Inverse of _pack_text."""
+    return zlib.decompress(base64.b64decode(packed)).decode("utf-8")
+
+
+def _unpack_vector_ids(buffer: bytes) -> list[str]:
+    """Split packed raw vector ids into the hex strings used as Pinecone ids."""
+    hex_ids = buffer.hex()
+    width = 2 * _VECTOR_ID_BYTES
+    return [hex_ids[start:start + width] for start in range(0, len(hex_ids), width)]
+
+
+def _is_transient_query_error(exc: Exception) -> bool:
+    """True for connection failures, timeouts and 5xx responses from Pinecone."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status >= 500
+    try:
+        from urllib3.exceptions import (
+            MaxRetryError,
+            NewConnectionError,
+            ProtocolError,
+            TimeoutError as Urllib3TimeoutError,
+        )
+    except ImportError:
+        return False
+    return isinstance(
+        exc, (MaxRetryError, NewConnectionError, ProtocolError, Urllib3TimeoutError)
+    )
+
+
+def _onnx_cache_dir(settings: Settings) -> str | None:
+    """Per-model ONNX export directory; relative roots resolve against the project root."""
+    if not settings.embedding_onnx_cache_dir:
+        return None
+    root = Path(settings.embedding_onnx_cache_dir)
+    if not root.is_absolute():
+        root = _PROJECT_ROOT / root
+    model = settings.embedding_model
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "--", model).strip("-")
+    digest = hashlib.sha256(model.encode("utf-8")).hexdigest()[:8]
+    return str(root / f"{slug}-{digest}")
+
+
+class _QueryEmbedBatcher:
+    """Coalesces concurrent single-query embeddings into one encode call.
+
+    Callers block on a future while a daemon worker drains the queue for up to
+    ``max_wait_seconds`` (or ``max_batch`` queries) and encodes them together.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], np.ndarray],
+        max_batch: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self._encode = encode
+        self._max_batch = max_batch
+        self._max_wait_seconds = max_wait_seconds
+        self._queue: queue.SimpleQueue[tuple[str, Future[np.ndarray]]] = queue.SimpleQueue()
+        self._start_lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+
+    def embed(self, text: str) -> np.ndarray:
+        if self._worker is None:
+            self._start()
+        future: Future[np.ndarray] = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="query-embed-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait_seconds
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = self._encode([text for text, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+# Settings that change how the embedder is loaded; part of its shared-instance key.
+_EMBEDDER_SETTINGS = (
+    "embedding_model",
+    "embedding_backend",
+    "embedding_onnx_cache_dir",
+    "embedding_quantize",
+    "embedding_device",
+    "embedding_precision",
+    "embedding_cpu_threads",
+)
+
 
 class VectorStoreService:
     """Encapsulates embedding, indexing, and semantic search."""
 
+    # Heavy clients and models are shared by every instance in the process. The lock
+    # serializes first-touch loads so concurrent constructors never load twice.
+    _shared_lock = threading.Lock()
+    _shared_resources: dict[tuple[Any, ...], Any] = {}
+
     def __init__(self) -> None:
         settings = get_settings()
 
@@ -36,25 +199,140 @@ class VectorStoreService:
             ) from exc
 
         self._serverless_spec_cls = ServerlessSpec
-        self._client = Pinecone(api_key=settings.pinecone_api_key)
+        self._client = self._get_shared(
+            ("pinecone", settings.pinecone_api_key),
+            lambda: Pinecone(api_key=settings.pinecone_api_key),
+        )
         self._index_name = settings.pinecone_index_name
 
         self._ensure_index()
-        self._index = self._client.Index(self._index_name)
+        self._index = self._client.Index(
+            self._index_name,
+            pool_threads=settings.pinecone_pool_threads,
+        )
 
         # Import retrieval-only dependencies lazily so app boot does not require them.
         from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        self._embedder = self._get_shared(
+            ("embedder", *(getattr(settings, name) for name in _EMBEDDER_SETTINGS)),
+            lambda: self._load_embedder(settings),
+        )
+        self._splitter = self._get_shared(
+            ("splitter", settings.retrieval_chunk_size, settings.retrieval_chunk_overlap),
+            lambda: RecursiveCharacterTextSplitter(
+                chunk_size=settings.retrieval_chunk_size,
+                chunk_overlap=settings.retrieval_chunk_overlap,
+            ),
+        )
+
+        self._init_local_caches()
+
+    @classmethod
+    def _get_shared(cls, key: tuple[Any, ...], factory: Callable[[], Any]) -> Any:
+        with cls._shared_lock:
+            resource = cls._shared_resources.get(key)
+            if resource is None:
+                resource = cls._shared_resources[key] = factory()
+            return resource
+
+    @staticmethod
+    def _load_embedder(settings: Settings) -> Any:
+        import torch
         from sentence_transformers import SentenceTransformer
 
-        self._embedder = SentenceTransformer(settings.embedding_model)
-        self._splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.retrieval_chunk_size,
-            chunk_overlap=settings.retrieval_chunk_overlap,
+        device = settings.embedding_device
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        if settings.embedding_backend == "onnx":
+            return VectorStoreService._load_onnx_embedder(settings, device)
+
+        embedder = SentenceTransformer(settings.embedding_model, device=device)
+        if device.startswith("cuda"):
+            # Half precision halves memory traffic and runs on tensor cores; _embed
+            # widens the output back to float32.
+            if settings.embedding_precision == "fp16":
+                embedder.half()
+            elif settings.embedding_precision == "bf16":
+                embedder.to(torch.bfloat16)
+        else:
+            torch.set_num_threads(max(1, min(settings.embedding_cpu_threads, os.cpu_count() or 1)))
+        return embedder
+
+    @staticmethod
+    def _load_onnx_embedder(settings: Settings, device: str) -> Any:
+        from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+        # ONNX Runtime runs the fused inference graph without PyTorch dispatch overhead.
+        # Models without a bundled onnx/model.onnx are exported on load, so keep the
+        # export on disk when a cache directory is configured.
+        cache_dir = _onnx_cache_dir(settings)
+        # A directory without the exported graph is an interrupted export, not a cache hit.
+        exported = cache_dir is not None and os.path.isfile(
+            os.path.join(cache_dir, _ONNX_MODEL_FILE)
+        )
+        provider = "CUDAExecutionProvider" if device.startswith("cuda") else "CPUExecutionProvider"
+        # Dynamic int8 quantization targets CPU VNNI kernels; GPUs keep the float graph.
+        quantize = (
+            settings.embedding_quantize and cache_dir is not None and not device.startswith("cuda")
         )
 
+        def load(model_path: str, **model_kwargs: Any) -> Any:
+            try:
+                return SentenceTransformer(
+                    model_path,
+                    device=device,
+                    backend="onnx",
+                    model_kwargs={"provider": provider, **model_kwargs},
+                )
+            except ImportError as exc:
+                raise ConfigurationError(
+                    "ONNX embedding backend is unavailable. Install `sentence-transformers[onnx]`.",
+                    details={"error": str(exc)},
+                ) from exc
+
+        if quantize and exported and os.path.isfile(os.path.join(cache_dir, _QUANTIZED_ONNX_FILE)):
+            return load(cache_dir, file_name=_QUANTIZED_ONNX_FILE)
+
+        embedder = load(cache_dir if exported else settings.embedding_model)
+        if cache_dir is not None and not exported:
+            # Export into a scratch directory and rename it into place, so a crash never
+            # leaves a half-written model where the next start would load it.
+            partial_dir = f"{cache_dir}.partial-{os.getpid()}"
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            embedder.save_pretrained(partial_dir)
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            os.replace(partial_dir, cache_dir)
+        if not quantize:
+            return embedder
+
+        export_dynamic_quantized_onnx_model(embedder, _QUANTIZATION_CONFIG, cache_dir)
+        return load(cache_dir, file_name=_QUANTIZED_ONNX_FILE)
+
+    def _init_local_caches(self) -> None:
         # Local caches used for hybrid fallback and source lifecycle operations.
-        self._keyword_cache: dict[str, list[dict[str, Any]]] = {}
-        self._source_vector_ids: dict[tuple[str, str], set[str]] = {}
+        # Per person: chunk entries and their L2-normalised float16 embeddings, row-aligned
+        # and published together as one immutable tuple so readers never see them apart.
+        self._local_index: dict[str, tuple[tuple[dict[str, Any], ...], np.ndarray]] = {}
+        # Vector ids per (person_id, source), packed as contiguous raw 16-byte ids.
+        self._source_vector_ids: dict[tuple[str, str], bytearray] = {}
+        # Guards every read-modify-write of _local_index and _source_vector_ids; upserts,
+        # deletes and fallback searches run on request threads.
+        self._local_lock = threading.Lock()
+        # Query embeddings are deterministic for a loaded model, so hot queries skip the
+        # forward pass. Single and batch search share this LRU of read-only float32
+        # rows; a racing miss only encodes twice.
+        self._query_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._query_vectors_lock = threading.Lock()
+        # Concurrent cache misses from request threads share one encode call.
+        self._query_batcher: _QueryEmbedBatcher | None = None
+        if self._settings.query_embed_batch_size > 1:
+            self._query_batcher = _QueryEmbedBatcher(
+                self._embed,
+                max_batch=self._settings.query_embed_batch_size,
+                max_wait_seconds=self._settings.query_embed_batch_wait_ms / 1000,
+            )
 
     def _ensure_index(self) -> None:
         existing_indexes = set(self._client.list_indexes().names())
@@ -71,27 +349,61 @@ class VectorStoreService:
             ),
         )
 
-    def _embed(self, texts: list[str]) -> list[list[float]]:
-        vectors = self._embedder.encode(
-            texts,
-            normalize_embeddings=True,
-            show_progress_bar=False,
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        # encode() length-sorts internally and returns rows in the caller's order.
+        return np.asarray(
+            self._embedder.encode(
+                texts,
+                batch_size=self._settings.embedding_batch_size,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                convert_to_tensor=False,
+            ),
+            dtype=np.float32,
         )
-        if hasattr(vectors, "tolist"):
-            return vectors.tolist()
-        return [list(row) for row in vectors]
 
-    def _split_documents(self, documents: list[str]) -> list[str]:
-        chunks: list[str] = []
+    def _cached_query_embedding(self, query: str) -> np.ndarray:
+        vector = self._get_cached_query_vector(query)
+        if vector is None:
+            vector = self._embed_query(query)
+            self._cache_query_vector(query, vector)
+        return vector
+
+    def _get_cached_query_vector(self, query: str) -> np.ndarray | None:
+        with self._query_vectors_lock:
+            vector = self._query_vectors.get(query)
+            if vector is not None:
+                self._query_vectors.move_to_end(query)
+            return vector
+
+    def _cache_query_vector(self, query: str, vector: np.ndarray) -> None:
+        maxsize = self._settings.query_embed_cache_size
+        if maxsize <= 0:
+            return
+        with self._query_vectors_lock:
+            self._query_vectors[query] = vector
+            self._query_vectors.move_to_end(query)
+            while len(self._query_vectors) > maxsize:
+                self._query_vectors.popitem(last=False)
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        if self._query_batcher is not None:
+            vector = self._query_batcher.embed(query)
+        else:
+            vector = self._embed([query])[0]
+        # Cached rows are shared across requests, so nobody may write through them.
+        vector.flags.writeable = False
+        return vector
+
+    def _iter_chunks(self, documents: Iterable[str]) -> Iterator[str]:
         for document in documents:
-            if not document or not document.strip():
+            if not document:
                 continue
-            chunks.extend(
-                chunk.strip()
-                for chunk in self._splitter.split_text(document)
-                if chunk and chunk.strip()
-            )
-        return chunks
+            for raw_chunk in self._splitter.split_text(document):
+                chunk = raw_chunk.strip()
+                if chunk:
+                    yield chunk
 
     def upsert_documents(
         self,
@@ -101,52 +413,156 @@ class VectorStoreService:
         extra_metadata: dict[str, Any] | None = None,
     ) -> int:
         """Chunk and index documents for a person."""
-        chunks = self._split_documents(documents)
-        if not chunks:
-            return 0
-
-        vectors = self._embed(chunks)
         metadata = extra_metadata or {}
         timestamp = datetime.now(timezone.utc).isoformat()
-
-        payload: list[dict[str, Any]] = []
-        for index, (chunk, vector) in enumerate(zip(chunks, vectors), start=1):
-            vector_id = str(uuid4())
-            payload.append(
-                {
-                    "id": vector_id,
-                    "values": vector,
-                    "metadata": {
-                        "person_id": person_id,
-                        "source": source,
-                        "chunk_index": index,
-                        "text": chunk,
-                        "created_at": timestamp,
-                        **metadata,
-                    },
-                }
+        batch_size = self._settings.pinecone_upsert_batch_size
+        window_size = self._settings.pinecone_document_chunk_size
+        compress_text = self._settings.pinecone_compress_text
+
+        base_metadata = {
+            "person_id": person_id,
+            "source": source,
+            "created_at": timestamp,
+            **metadata,
+        }
+
+        # Per window: dispatched upsert results, raw ids, local metadata and embeddings.
+        windows: list[tuple[list[Any], bytes, list[dict[str, Any]], np.ndarray]] = []
+        errors: list[Exception] = []
+        dispatched = 0
+        # Pull chunks lazily so the first window is embedded before later documents are split.
+        chunk_stream = self._iter_chunks(documents)
+        window_start = 0
+        try:
+            while window_chunks := list(islice(chunk_stream, window_size)):
+                vectors = self._embed(window_chunks)
+
+                # One urandom call and one hex conversion cover every id in the window.
+                window_ids = os.urandom(_VECTOR_ID_BYTES * len(window_chunks))
+                hex_ids = window_ids.hex()
+                hex_width = 2 * _VECTOR_ID_BYTES
+
+                window_payload: list[dict[str, Any]] = []
+                # Full-text metadata for the local keyword cache, aligned with the payload.
+                window_local: list[dict[str, Any]] = []
+                append = window_payload.append
+                append_local = window_local.append
+                copy_base = base_metadata.copy
+                pack_text = _pack_text
+                for offset, (chunk, vector) in enumerate(zip(window_chunks, vectors)):
+                    index = window_start + offset + 1
+                    vector_id = hex_ids[offset * hex_width:(offset + 1) * hex_width]
+                    chunk_metadata = copy_base()
+                    chunk_metadata["chunk_index"] = index
+                    chunk_metadata["text"] = chunk
+                    append_local(chunk_metadata)
+                    packed = pack_text(chunk) if compress_text else None
+                    # base64 inflates short chunks, so only ship the packed form when it is
+                    # smaller. Only the wire copy is packed; the local cache keeps plain text.
+                    if packed is not None and len(packed) < len(chunk.encode("utf-8")):
+                        wire_metadata = copy_base()
+                        wire_metadata["chunk_index"] = index
+                        wire_metadata[_PACKED_TEXT_KEY] = packed
+                    else:
+                        wire_metadata = chunk_metadata
+                    append({"id": vector_id, "values": vector.tolist(), "metadata": wire_metadata})
+
+                # Dispatch this window's batches on the client's thread pool before embedding
+                # the next window, so encoding overlaps with in-flight upserts. The window is
+                # recorded first so a failed dispatch still drains its earlier batches.
+                pending: list[Any] = []
+                windows.append((pending, window_ids, window_local, vectors))
+                for batch_start in range(0, len(window_payload), batch_size):
+                    pending.append(
+                        self._index.upsert(
+                            vectors=window_payload[batch_start:batch_start + batch_size],
+                            async_req=True,
+                        )
+                    )
+                dispatched += 1
+                window_start += len(window_chunks)
+        except Exception as exc:
+            errors.append(exc)
+
+        # Await every in-flight batch, even after a failure, and only cache windows whose
+        # batches were all confirmed so the local index never holds unwritten vectors.
+        confirmed: list[tuple[list[Any], bytes, list[dict[str, Any]], np.ndarray]] = []
+        unconfirmed_ids = bytearray()
+        for position, window in enumerate(windows):
+            window_ok = position < dispatched
+            for result in window[0]:
+                try:
+                    result.get()
+                except Exception as exc:
+                    errors.append(exc)
+                    window_ok = False
+            if window_ok:
+                confirmed.append(window)
+            else:
+                unconfirmed_ids += window[1]
+
+        if confirmed:
+            raw_ids = b"".join(window[1] for window in confirmed)
+            self._cache_upserted(
+                person_id,
+                source,
+                raw_ids,
+                _unpack_vector_ids(raw_ids),
+                [item for window in confirmed for item in window[2]],
+                np.concatenate([window[3] for window in confirmed]),
             )
+        if errors:
+            logger.error(
+                f"Upsert for person {person_id} source {source} failed after indexing "
+                f"{sum(len(window[2]) for window in confirmed)} chunks; unconfirmed ids: "
+                f"{_unpack_vector_ids(bytes(unconfirmed_ids))}"
+            )
+            raise errors[0]
+        return sum(len(window[2]) for window in windows)
 
-        self._index.upsert(vectors=payload)
-
-        key = (person_id, source)
-        self._source_vector_ids.setdefault(key, set()).update(item["id"] for item in payload)
-        cache_entries = self._keyword_cache.setdefault(person_id, [])
-        cache_entries.extend(
+    def _cache_upserted(
+        self,
+        person_id: str,
+        source: str,
+        raw_ids: bytes,
+        vector_ids: list[str],
+        local_metadata: list[dict[str, Any]],
+        vectors: np.ndarray,
+    ) -> None:
+        """Append upserted chunks to the local fallback index in one atomic publish."""
+        new_entries = tuple(
             {
-                "id": item["id"],
-                "source": item["metadata"]["source"],
-                "text": item["metadata"]["text"],
-                "metadata": item["metadata"],
+                "id": vector_id,
+                "source": chunk_metadata["source"],
+                "text": chunk_metadata["text"],
+                "tokens": _tokenize(chunk_metadata["text"]),
+                "metadata": chunk_metadata,
             }
-            for item in payload
+            for vector_id, chunk_metadata in zip(vector_ids, local_metadata)
         )
-        return len(payload)
+        new_rows = vectors.astype(np.float16)
+        with self._local_lock:
+            self._source_vector_ids.setdefault((person_id, source), bytearray()).extend(raw_ids)
+            current = self._local_index.get(person_id)
+            if current is None:
+                entries, rows = new_entries, new_rows
+            else:
+                entries = current[0] + new_entries
+                rows = np.concatenate([current[1], new_rows])
+            rows.flags.writeable = False
+            self._local_index[person_id] = (entries, rows)
+
+    def _local_snapshot(
+        self, person_id: str
+    ) -> tuple[tuple[dict[str, Any], ...], np.ndarray] | None:
+        with self._local_lock:
+            return self._local_index.get(person_id)
 
     def delete_by_source(self, person_id: str, source: str) -> int:
         """Delete all indexed chunks for a person/source pair."""
         key = (person_id, source)
-        existing_ids = list(self._source_vector_ids.get(key, set()))
+        with self._local_lock:
+            existing_ids = bytes(self._source_vector_ids.get(key, b""))
 
         try:
             self._index.delete(
@@ -157,17 +573,24 @@ class VectorStoreService:
             )
         except TypeError:
             if existing_ids:
-                self._index.delete(ids=existing_ids)
-
-        deleted_count = len(existing_ids)
-        self._source_vector_ids.pop(key, None)
-
-        if person_id in self._keyword_cache:
-            before = len(self._keyword_cache[person_id])
-            self._keyword_cache[person_id] = [
-                item for item in self._keyword_cache[person_id] if item.get("source") != source
-            ]
-            deleted_count = max(deleted_count, before - len(self._keyword_cache[person_id]))
+                self._index.delete(ids=_unpack_vector_ids(existing_ids))
+
+        deleted_count = len(existing_ids) // _VECTOR_ID_BYTES
+        with self._local_lock:
+            self._source_vector_ids.pop(key, None)
+            current = self._local_index.get(person_id)
+            if current is not None:
+                entries, rows = current
+                keep = np.fromiter(
+                    (item.get("source") != source for item in entries),
+                    dtype=bool,
+                    count=len(entries),
+                )
+                kept_entries = tuple(item for item, kept in zip(entries, keep) if kept)
+                kept_rows = rows[keep]
+                kept_rows.flags.writeable = False
+                self._local_index[person_id] = (kept_entries, kept_rows)
+                deleted_count = max(deleted_count, len(entries) - len(kept_entries))
 
         return deleted_count
 
@@ -188,29 +611,63 @@ class VectorStoreService:
         )
         return deleted, indexed
 
+    def _vector_fallback(
+        self,
+        person_id: str,
+        query_vector: np.ndarray,
+        top_k: int,
+        min_score: float,
+    ) -> list[dict[str, Any]]:
+        """Fallback cosine retrieval over locally cached embeddings."""
+        snapshot = self._local_snapshot(person_id)
+        if snapshot is None or not len(snapshot[0]) or top_k <= 0:
+            return []
+        entries, person_vectors = snapshot
+
+        # Rows are unit-length, so one matrix-vector product gives every cosine score.
+        scores = person_vectors @ query_vector
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results: list[dict[str, Any]] = []
+        for row in top.tolist():
+            score = float(scores[row])
+            if score < min_score:
+                break
+            item = entries[row]
+            results.append(
+                {
+                    "id": str(item.get("id", "")),
+                    "score": score,
+                    "text": str(item.get("text", "")),
+                    "source": item.get("source"),
+                    "metadata": item.get("metadata", {}),
+                    "retrieval_mode": "vector_fallback",
+                }
+            )
+        return results
+
     def _keyword_search(self, person_id: str, query: str, top_k: int) -> list[dict[str, Any]]:
         """Fallback lexical retrieval across locally cached chunks."""
-        tokens = {token for token in query.lower().split() if token}
+        tokens = _tokenize(query)
         if not tokens:
             return []
 
-        entries = self._keyword_cache.get(person_id, [])
+        snapshot = self._local_snapshot(person_id)
+        entries = snapshot[0] if snapshot is not None else ()
         scored: list[tuple[float, dict[str, Any]]] = []
         for item in entries:
-            text = str(item.get("text", "")).lower()
-            if not text:
-                continue
-
-            overlap = sum(1 for token in tokens if token in text)
+            # Chunk token sets are precomputed at upsert time; matching is a set intersection.
+            overlap = len(tokens & item["tokens"])
             if overlap <= 0:
                 continue
 
             score = overlap / len(tokens)
             scored.append((score, item))
 
-        scored.sort(key=lambda entry: entry[0], reverse=True)
         results: list[dict[str, Any]] = []
-        for score, item in scored[:top_k]:
+        for score, item in heapq.nlargest(top_k, scored, key=lambda entry: entry[0]):
             results.append(
                 {
                     "id": str(item.get("id", "")),
@@ -232,43 +689,74 @@ class VectorStoreService:
         enable_hybrid_fallback: bool = True,
     ) -> list[dict[str, Any]]:
         """Run semantic search filtered by person."""
-        query_vector = self._embed([query])[0]
-        response = self._index.query(
-            vector=query_vector,
+        return self._search_with_vector(
+            person_id=person_id,
+            query=query,
+            query_vector=self._cached_query_embedding(query),
             top_k=top_k,
-            include_metadata=True,
-            include_values=False,
-            filter={"person_id": {"$eq": person_id}},
+            min_score=min_score,
+            enable_hybrid_fallback=enable_hybrid_fallback,
         )
 
-        matches = getattr(response, "matches", None)
-        if matches is None and isinstance(response, dict):
-            matches = response.get("matches", [])
-
-        results: list[dict[str, Any]] = []
-        for match in matches or []:
-            match_id = getattr(match, "id", None)
-            if match_id is None and isinstance(match, dict):
-                match_id = match.get("id", "")
-
-            score = getattr(match, "score", None)
-            if score is None and isinstance(match, dict):
-                score = match.get("score", 0.0)
+    def search_batch(
+        self,
+        person_id: str,
+        queries: list[str],
+        top_k: int = 5,
+        min_score: float = 0.0,
+        enable_hybrid_fallback: bool = True,
+    ) -> list[list[dict[str, Any]]]:
+        """Run several person-scoped searches, embedding all uncached queries in one pass."""
+        unique_queries = list(dict.fromkeys(queries))
+        if not unique_queries:
+            return []
 
-            metadata = getattr(match, "metadata", None)
-            if metadata is None and isinstance(match, dict):
-                metadata = match.get("metadata", {})
-            metadata = metadata or {}
+        vectors: dict[str, np.ndarray] = {}
+        misses: list[str] = []
+        for query in unique_queries:
+            cached = self._get_cached_query_vector(query)
+            if cached is None:
+                misses.append(query)
+            else:
+                vectors[query] = cached
+        if misses:
+            encoded = self._embed(misses)
+            encoded.flags.writeable = False
+            for query, vector in zip(misses, encoded):
+                self._cache_query_vector(query, vector)
+                vectors[query] = vector
+        return [
+            self._search_with_vector(
+                person_id=person_id,
+                query=query,
+                query_vector=vectors[query],
+                top_k=top_k,
+                min_score=min_score,
+                enable_hybrid_fallback=enable_hybrid_fallback,
+            )
+            for query in queries
+        ]
 
-            numeric_score = float(score or 0.0)
-            if numeric_score < min_score:
-                continue
+    def _search_with_vector(
+        self,
+        person_id: str,
+        query: str,
+        query_vector: np.ndarray,
+        top_k: int,
+        min_score: float,
+        enable_hybrid_fallback: bool,
+    ) -> list[dict[str, Any]]:
+        matches = self._query_matches(person_id, query_vector, top_k, enable_hybrid_fallback)
 
-            results.append(
+        results: list[dict[str, Any]] = []
+        append = results.append
+        _str = str
+        for match_id, score, metadata in self._iter_vector_matches(matches, min_score):
+            append(
                 {
-                    "id": str(match_id or ""),
-                    "score": numeric_score,
-                    "text": str(metadata.get("text", "")),
+                    "id": match_id,
+                    "score": score,
+                    "text": _str(metadata.get("text", "")),
                     "source": metadata.get("source"),
                     "metadata": metadata,
                     "retrieval_mode": "vector",
@@ -276,10 +764,91 @@ class VectorStoreService:
             )
 
         if results:
-            results.sort(key=lambda item: float(item.get("score", 0.0)), reverse=True)
-            return results[:top_k]
+            return heapq.nlargest(top_k, results, key=lambda item: item["score"])
 
         if enable_hybrid_fallback:
-            return self._keyword_search(person_id=person_id, query=query, top_k=top_k)
+            return self._local_fallback(person_id, query, query_vector, top_k, min_score)
 
         return []
+
+    def _query_matches(
+        self,
+        person_id: str,
+        query_vector: np.ndarray,
+        top_k: int,
+        enable_hybrid_fallback: bool,
+    ) -> list[Any]:
+        try:
+            response = self._index.query(
+                vector=query_vector.tolist(),
+                top_k=top_k,
+                include_metadata=True,
+                include_values=False,
+                filter={"person_id": {"$eq": person_id}},
+            )
+        except Exception as exc:
+            # Only outages fall back; auth, config and filter errors must surface.
+            if not enable_hybrid_fallback or not _is_transient_query_error(exc):
+                raise
+            logger.warning(f"Pinecone query failed, using local fallback: {exc}")
+            return []
+
+        matches = getattr(response, "matches", None)
+        if matches is None and isinstance(response, dict):
+            matches = response.get("matches", [])
+        return matches or []
+
+    @staticmethod
+    def _iter_vector_matches(
+        matches: list[Any],
+        min_score: float,
+    ) -> Iterator[tuple[str, float, dict[str, Any]]]:
+        """Yield (id, score, metadata) for matches at or above min_score, text unpacked."""
+        # Bind builtins and helpers once; the per-match loop runs on local lookups only.
+        _getattr = getattr
+        _isinstance = isinstance
+        _float = float
+        _str = str
+        _dict = dict
+        unpack_text = _unpack_text
+        packed_key = _PACKED_TEXT_KEY
+
+        for match in matches:
+            match_id = _getattr(match, "id", None)
+            if match_id is None and _isinstance(match, _dict):
+                match_id = match.get("id", "")
+
+            score = _getattr(match, "score", None)
+            if score is None and _isinstance(match, _dict):
+                score = match.get("score", 0.0)
+
+            metadata = _getattr(match, "metadata", None)
+            if metadata is None and _isinstance(match, _dict):
+                metadata = match.get("metadata", {})
+            metadata = metadata or {}
+
+            numeric_score = _float(score or 0.0)
+            if numeric_score < min_score:
+                continue
+
+            packed_text = metadata.get(packed_key)
+            if packed_text is not None:
+                metadata = {key: value for key, value in metadata.items() if key != packed_key}
+                metadata["text"] = unpack_text(packed_text)
+
+            yield _str(match_id or ""), numeric_score, metadata
+
+    def _local_fallback(
+        self,
+        person_id: str,
+        query: str,
+        query_vector: np.ndarray,
+        top_k: int,
+        min_score: float,
+    ) -> list[dict[str, Any]]:
+        return self._vector_fallback(
+            person_id=person_id,
+            query_vector=query_vector,
+            top_k=top_k,
+            min_score=min_score,
+        ) or self._keyword_search(person_id=person_id, query=query, top_k=top_k)
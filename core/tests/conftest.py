@@ -2,7 +2,22 @@
 from pathlib import Path
 import sys
 
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop ships with uvicorn[standard] but not on Windows.
+    uvloop = None
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+if uvloop is not None:
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop; without it pytest-asyncio keeps its default loop."""
+        return {"uvloop": uvloop.new_event_loop}
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pytest
 from httpx import ASGITransport, AsyncClient
 
@@ -6,6 +8,13 @@ from src.main import app
 from src.services.conversation_service import reset_conversation_store
 from src.services.knowledge_service import reset_knowledge_store
 from src.services.person_service import reset_person_store
+from tests.utils import jget
+
+
+@lru_cache(maxsize=1)
+def _transport() -> ASGITransport:
+    """Build the in-process transport once per test session and share it."""
+    return ASGITransport(app=app)
 
 
 @pytest.fixture(autouse=True)
@@ -16,7 +25,7 @@ def reset_stores():
 
 
 @pytest.mark.asyncio
-async def test_same_question_returns_persona_specific_responses(monkeypatch):
+async def test_same_question_returns_persona_specific_responses():
     async def fake_generate_with_retry(prompt: str, max_attempts: int = 3, retry_delay_seconds: float = 0.5):
         if "Role: Backend Engineer" in prompt:
             return "Backend path: check DB query plan first."
@@ -24,36 +33,38 @@ async def test_same_question_returns_persona_specific_responses(monkeypatch):
             return "SRE path: check error budget and rollback conditions."
         return "Generic answer"
 
-    monkeypatch.setattr(main_module, "generate_with_retry", fake_generate_with_retry)
-
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        backend_person = await client.post(
-            "/v1/persons",
-            json={
-                "name": "Asha",
-                "role": "Backend Engineer",
-                "department": "Platform",
-                "base_system_prompt": "Answer as Asha.",
-            },
-        )
-        sre_person = await client.post(
-            "/v1/persons",
-            json={
-                "name": "Kiran",
-                "role": "Infrastructure SRE",
-                "department": "Infra",
-                "base_system_prompt": "Answer as Kiran.",
-            },
-        )
-
-        backend_id = backend_person.json()["id"]
-        sre_id = sre_person.json()["id"]
-
-        q = "How should we handle production latency?"
-        backend_chat = await client.post("/v1/chat", json={"person_id": backend_id, "message": q})
-        sre_chat = await client.post("/v1/chat", json={"person_id": sre_id, "message": q})
+    app.dependency_overrides[main_module.get_llm_generator] = lambda: fake_generate_with_retry
+    transport = _transport()
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            backend_person = await client.post(
+                "/v1/persons",
+                json={
+                    "name": "Asha",
+                    "role": "Backend Engineer",
+                    "department": "Platform",
+                    "base_system_prompt": "Answer as Asha.",
+                },
+            )
+            sre_person = await client.post(
+                "/v1/persons",
+                json={
+                    "name": "Kiran",
+                    "role": "Infrastructure SRE",
+                    "department": "Infra",
+                    "base_system_prompt": "Answer as Kiran.",
+                },
+            )
+
+            backend_id = jget(backend_person)["id"]
+            sre_id = jget(sre_person)["id"]
+
+            q = "How should we handle production latency?"
+            backend_chat = await client.post("/v1/chat", json={"person_id": backend_id, "message": q})
+            sre_chat = await client.post("/v1/chat", json={"person_id": sre_id, "message": q})
+    finally:
+        app.dependency_overrides.clear()
 
     assert backend_chat.status_code == 200
     assert sre_chat.status_code == 200
-    assert backend_chat.json()["response"] != sre_chat.json()["response"]
+    assert jget(backend_chat)["response"] != jget(sre_chat)["response"]
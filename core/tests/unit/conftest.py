@@ -0,0 +1,28 @@
+"""Shared fixtures for unit tests."""
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+from src.main import app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """One ASGI client for the whole run; tests share its transport and pool."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as shared_client:
+        yield shared_client
+
+
+@pytest.fixture(scope="session")
+def sync_client():
+    """Blocking client for tests that only exercise sync fakes; lifespan is not started."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def dependency_overrides():
+    """Expose app.dependency_overrides and clear it once the test finishes."""
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
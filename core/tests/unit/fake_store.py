@@ -0,0 +1,109 @@
+"""In-memory numpy vector store with the VectorStoreService interface for endpoint tests."""
+import re
+import zlib
+from typing import Any
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def hashed_embedding(text: str, dimensions: int) -> np.ndarray:
+    """Deterministic bag-of-words embedding: each token bumps one crc32-hashed slot."""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        vector[zlib.crc32(token.encode()) % dimensions] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class NumpyVectorStore:
+    """Scores every stored chunk with one float32 matrix-vector product per query."""
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.embeddings = np.empty((0, dimensions), dtype=np.float32)
+        self.records: list[dict[str, Any]] = []
+        self._next_id = 0
+
+    def upsert_documents(self, person_id: str, documents: list[str], source: str = "manual"):
+        chunks = [
+            chunk.strip()
+            for document in documents
+            for chunk in document.split("\n\n")
+            if chunk.strip()
+        ]
+        if not chunks:
+            return 0
+
+        start = self._next_id
+        self._next_id += len(chunks)
+        self.records.extend(
+            {
+                "id": f"vec-{start + offset}",
+                "person_id": person_id,
+                "source": source,
+                "text": chunk,
+            }
+            for offset, chunk in enumerate(chunks)
+        )
+        rows = np.stack([hashed_embedding(chunk, self.dimensions) for chunk in chunks])
+        self.embeddings = np.ascontiguousarray(np.concatenate([self.embeddings, rows]))
+        return len(chunks)
+
+    def search(
+        self,
+        person_id: str,
+        query: str,
+        top_k: int = 5,
+        min_score: float = 0.0,
+        enable_hybrid_fallback: bool = True,
+    ):
+        owned = np.fromiter(
+            (record["person_id"] == person_id for record in self.records),
+            dtype=bool,
+            count=len(self.records),
+        )
+        scores = self.embeddings @ hashed_embedding(query, self.dimensions)
+        candidates = np.flatnonzero(owned & (scores >= min_score))
+        if candidates.size > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [
+            {
+                "id": self.records[position]["id"],
+                "score": float(scores[position]),
+                "text": self.records[position]["text"],
+                "source": self.records[position]["source"],
+                "metadata": {"person_id": person_id},
+                "retrieval_mode": "vector",
+            }
+            for position in ranked
+        ]
+
+    def search_batch(
+        self,
+        person_id: str,
+        queries: list[str],
+        top_k: int = 5,
+        min_score: float = 0.0,
+        enable_hybrid_fallback: bool = True,
+    ):
+        return [self.search(person_id, query, top_k, min_score) for query in queries]
+
+    def delete_by_source(self, person_id: str, source: str):
+        keep = np.fromiter(
+            (
+                not (record["person_id"] == person_id and record["source"] == source)
+                for record in self.records
+            ),
+            dtype=bool,
+            count=len(self.records),
+        )
+        self.records = [record for record, kept in zip(self.records, keep) if kept]
+        self.embeddings = np.ascontiguousarray(self.embeddings[keep])
+        return int((~keep).sum())
+
+    def replace_source_documents(self, person_id: str, source: str, documents: list[str]):
+        deleted = self.delete_by_source(person_id, source)
+        return deleted, self.upsert_documents(person_id, documents, source=source)
@@ -0,0 +1,80 @@
+import httpx
+import orjson
+import pytest
+
+from config.settings import Settings
+from src.core.exceptions import PermanentLLMError, RetriableLLMError
+from src.services import gemini_client
+
+
+@pytest.fixture
+def gemini_settings(monkeypatch):
+    settings = Settings(gemini_api_key="test-key", gemini_model="models/gemini-test")
+    monkeypatch.setattr(gemini_client, "get_settings", lambda: settings)
+    return settings
+
+
+def _use_transport(monkeypatch, handler) -> None:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(gemini_client, "get_client", lambda: client)
+
+
+@pytest.mark.asyncio
+async def test_get_client_reuses_instance_until_closed():
+    client = gemini_client.get_client()
+    assert gemini_client.get_client() is client
+
+    await gemini_client.close_client()
+    assert client.is_closed
+    assert gemini_client.get_client() is not client
+
+    await gemini_client.close_client()
+
+
+@pytest.mark.asyncio
+async def test_generate_text_returns_first_candidate_text(monkeypatch, gemini_settings):
+    captured = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured["url"] = str(request.url)
+        captured["payload"] = orjson.loads(request.content)
+        return httpx.Response(
+            200,
+            content=orjson.dumps({"candidates": [{"content": {"parts": [{"text": "hi"}]}}]}),
+        )
+
+    _use_transport(monkeypatch, handler)
+
+    assert await gemini_client.generate_text("hello") == "hi"
+    assert "/models/gemini-test:generateContent" in captured["url"]
+    assert captured["payload"]["contents"][0]["parts"][0]["text"] == "hello"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("status_code", "expected_error"),
+    [
+        (429, RetriableLLMError),
+        (503, RetriableLLMError),
+        (400, PermanentLLMError),
+        (404, PermanentLLMError),
+    ],
+)
+async def test_generate_text_classifies_http_errors(
+    monkeypatch, gemini_settings, status_code, expected_error
+):
+    _use_transport(monkeypatch, lambda request: httpx.Response(status_code, text="nope"))
+
+    with pytest.raises(expected_error):
+        await gemini_client.generate_text("hello")
+
+
+@pytest.mark.asyncio
+async def test_generate_text_treats_transport_errors_as_retriable(monkeypatch, gemini_settings):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    _use_transport(monkeypatch, handler)
+
+    with pytest.raises(RetriableLLMError):
+        await gemini_client.generate_text("hello")
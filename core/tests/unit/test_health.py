@@ -1,30 +1,36 @@
 import pytest
-from httpx import ASGITransport, AsyncClient
 
-
-from src.main import app  # noqa: E402
+from src.main import app
+from tests.utils import jget
 
 
 @pytest.mark.asyncio
-async def test_root_endpoint():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.get("/")
+async def test_root_endpoint(client):
+    response = await client.get("/")
 
     assert response.status_code == 200
-    data = response.json()
+    data = jget(response)
     assert data["health"] == "/health"
     assert data["docs"] == "/docs"
 
 
 @pytest.mark.asyncio
-async def test_health_endpoint():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.get("/health")
+async def test_health_endpoint(client):
+    response = await client.get("/health")
 
     assert response.status_code == 200
-    data = response.json()
+    data = jget(response)
     assert data["status"] == "healthy"
     assert data["database"] is False
     assert "timestamp" in data
+
+
+@pytest.mark.asyncio
+async def test_openapi_schema_is_generated_once(client):
+    schema = app.openapi()
+
+    response = await client.get("/openapi.json")
+
+    assert response.status_code == 200
+    assert app.openapi() is schema
+    assert "/v1/retrieval/index_and_search" in jget(response)["paths"]
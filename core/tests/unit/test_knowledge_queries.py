@@ -0,0 +1,12 @@
+from sqlalchemy.dialects import postgresql
+
+from src.services.knowledge_queries import select_top_knowledge
+
+
+def test_select_top_knowledge_orders_and_limits_in_sql():
+    statement = select_top_knowledge("person_x", 3)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "WHERE knowledge_entries.person_id =" in sql
+    assert "ORDER BY knowledge_entries.priority DESC, knowledge_entries.created_at DESC" in sql
+    assert "LIMIT" in sql
@@ -0,0 +1,60 @@
+import pytest
+
+from src.core.exceptions import NotFoundError
+from src.models.schemas import KnowledgeEntryCreate, KnowledgeEntryUpdate, PersonCreate
+from src.services.knowledge_service import (
+    add_knowledge_entry,
+    list_knowledge_entries,
+    render_knowledge_context,
+    reset_knowledge_store,
+    update_knowledge_entry,
+)
+from src.services.person_service import create_person, reset_person_store
+
+
+@pytest.fixture(autouse=True)
+def reset_stores():
+    reset_person_store()
+    reset_knowledge_store()
+
+
+def test_render_knowledge_context_reflects_writes():
+    person = create_person(PersonCreate(name="Rahul"))
+    entry = add_knowledge_entry(
+        person.id,
+        KnowledgeEntryCreate(content="Check logs first.", source_type="manual"),
+    )
+    assert "Check logs first." in render_knowledge_context(person.id)
+
+    add_knowledge_entry(
+        person.id,
+        KnowledgeEntryCreate(content="Roll back before debugging.", source_type="manual"),
+    )
+    assert "Roll back before debugging." in render_knowledge_context(person.id)
+
+    update_knowledge_entry(person.id, entry.id, KnowledgeEntryUpdate(content="Check metrics first."))
+    rendered = render_knowledge_context(person.id)
+    assert "Check metrics first." in rendered
+    assert "Check logs first." not in rendered
+
+
+def test_list_knowledge_entries_returns_newest_first():
+    person = create_person(PersonCreate(name="Nina"))
+    first = add_knowledge_entry(
+        person.id,
+        KnowledgeEntryCreate(content="First.", source_type="manual"),
+    )
+    second = add_knowledge_entry(
+        person.id,
+        KnowledgeEntryCreate(content="Second.", source_type="manual"),
+    )
+
+    assert [entry.id for entry in list_knowledge_entries(person.id)] == [second.id, first.id]
+    assert render_knowledge_context(person.id, max_entries=1).endswith("Second.")
+
+
+def test_update_knowledge_entry_raises_for_unknown_id():
+    person = create_person(PersonCreate(name="Asha"))
+
+    with pytest.raises(NotFoundError):
+        update_knowledge_entry(person.id, "missing", KnowledgeEntryUpdate(title="x"))
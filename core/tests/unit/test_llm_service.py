@@ -1,6 +1,6 @@
 import pytest
 
-from src.core.exceptions import LLMError
+from src.core.exceptions import LLMError, PermanentLLMError, RetriableLLMError
 from src.services import llm_service
 
 
@@ -11,7 +11,7 @@ async def test_generate_with_retry_succeeds_after_retry(monkeypatch):
     async def flaky_generate_text(prompt: str) -> str:
         calls["count"] += 1
         if calls["count"] < 2:
-            raise RuntimeError("temporary failure")
+            raise RetriableLLMError("temporary failure")
         return "ok"
 
     monkeypatch.setattr(llm_service, "generate_text", flaky_generate_text)
@@ -30,3 +30,33 @@ async def test_generate_with_retry_raises_llm_error(monkeypatch):
 
     with pytest.raises(LLMError):
         await llm_service.generate_with_retry("hello", max_attempts=2, retry_delay_seconds=0)
+
+
+@pytest.mark.asyncio
+async def test_generate_with_retry_does_not_retry_permanent_errors(monkeypatch):
+    calls = {"count": 0}
+
+    async def rejected(prompt: str) -> str:
+        calls["count"] += 1
+        raise PermanentLLMError("bad request", {"status_code": 400})
+
+    monkeypatch.setattr(llm_service, "generate_text", rejected)
+
+    with pytest.raises(PermanentLLMError):
+        await llm_service.generate_with_retry("hello", max_attempts=3, retry_delay_seconds=0)
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_with_retry_raises_after_exhausting_retries(monkeypatch):
+    calls = {"count": 0}
+
+    async def unavailable(prompt: str) -> str:
+        calls["count"] += 1
+        raise RetriableLLMError("unavailable", {"status_code": 503})
+
+    monkeypatch.setattr(llm_service, "generate_text", unavailable)
+
+    with pytest.raises(RetriableLLMError):
+        await llm_service.generate_with_retry("hello", max_attempts=3, retry_delay_seconds=0)
+    assert calls["count"] == 3
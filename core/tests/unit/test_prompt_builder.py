@@ -1,9 +1,11 @@
 import pytest
 
+from src.services import prompt_builder
 from src.services.prompt_builder import (
     build_prompt,
     build_persona_system_prompt,
     collect_knowledge_inputs,
+    collect_knowledge_inputs_async,
 )
 
 
@@ -39,6 +41,17 @@ def test_collect_knowledge_inputs_reads_repo_files():
     assert "Deploy only after CI passes" in parts[0]
 
 
+@pytest.mark.asyncio
+async def test_collect_knowledge_inputs_async_reads_repo_files():
+    parts = await collect_knowledge_inputs_async(
+        knowledge_text="  Inline note.  ",
+        knowledge_files=["tests/fixtures/sample_knowledge.txt"],
+    )
+
+    assert parts[0] == "Inline note."
+    assert "Deploy only after CI passes" in parts[1]
+
+
 def test_collect_knowledge_inputs_rejects_outside_repo():
     with pytest.raises(ValueError):
         collect_knowledge_inputs(knowledge_files=["C:\\Windows\\System32\\drivers\\etc\\hosts"])
@@ -55,3 +68,14 @@ def test_build_persona_system_prompt_template():
     assert "Person Profile:" in prompt
     assert "Name: Rahul" in prompt
     assert "Role: Backend Engineer" in prompt
+
+
+def test_read_knowledge_files_picks_up_file_changes(tmp_path, monkeypatch):
+    knowledge_file = tmp_path / "notes.txt"
+    knowledge_file.write_text("first version", encoding="utf-8")
+    monkeypatch.setattr(prompt_builder, "_resolve_knowledge_paths", lambda paths: [knowledge_file])
+
+    assert prompt_builder.read_knowledge_files([str(knowledge_file)]) == ["first version"]
+
+    knowledge_file.write_text("second, longer version", encoding="utf-8")
+    assert prompt_builder.read_knowledge_files([str(knowledge_file)]) == ["second, longer version"]
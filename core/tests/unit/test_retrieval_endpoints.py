@@ -1,16 +1,92 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import orjson
 import pytest
-from httpx import ASGITransport, AsyncClient
 
 import src.main as main_module
-from src.main import app
+from tests.unit.fake_store import NumpyVectorStore
+from tests.utils import asgi_post, jget
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Request bodies are encoded once at import time and posted as raw bytes.
+_INDEX_PAYLOAD = orjson.dumps(
+    {
+        "person_id": "person_x",
+        "source": "manual",
+        "knowledge_text": "Blue-green deploy strategy with two target groups.",
+    }
+)
+_SEARCH_PAYLOAD = orjson.dumps(
+    {
+        "person_id": "person_x",
+        "query": "How do we deploy safely?",
+        "top_k": 4,
+        "min_score": 0.5,
+    }
+)
+_INDEX_AND_SEARCH_PAYLOAD = orjson.dumps(
+    {
+        "person_id": "person_x",
+        "source": "ops/deploy_runbook.md",
+        "knowledge_text": "Blue-green deploy strategy with two target groups.",
+        "query": "How do we deploy safely?",
+        "top_k": 3,
+    }
+)
+_BATCH_QUERIES = [f"deploy question {index}" for index in range(50)]
+_SEARCH_BATCH_PAYLOAD = orjson.dumps(
+    {"person_id": "person_x", "queries": _BATCH_QUERIES, "top_k": 3}
+)
+_CHAT_PAYLOAD = orjson.dumps(
+    {
+        "person_id": "person_x",
+        "message": "How do we deploy safely?",
+        "use_retrieval": True,
+    }
+)
+_DELETE_PAYLOAD = orjson.dumps({"person_id": "person_x", "source": "runbook"})
+_REPLACE_PAYLOAD = orjson.dumps(
+    {
+        "person_id": "person_x",
+        "source": "runbook",
+        "knowledge_text": "Deployment notes",
+    }
+)
+
+# Shared read-only search result; the caller's person_id is captured on last_search instead.
+_FAKE_SEARCH_RESULT = (
+    MappingProxyType(
+        {
+            "id": "vec-1",
+            "score": 0.88,
+            "text": "Use blue-green rollout for production deploys.",
+            "source": "ops/deploy_runbook.md",
+            "metadata": MappingProxyType({}),
+            "retrieval_mode": "vector",
+        }
+    ),
+)
+
+
+@dataclass(slots=True)
+class SearchCall:
+    person_id: str
+    query: str
+    top_k: int
+    min_score: float
+    enable_hybrid_fallback: bool
 
 
 class FakeVectorStore:
     def __init__(self):
         self.last_upsert = None
-        self.last_search = None
+        self.last_search: SearchCall | None = None
         self.last_delete = None
         self.last_replace = None
+        self.last_search_batch = None
+        self.search_batch_calls = 0
 
     def upsert_documents(self, person_id: str, documents: list[str], source: str = "manual"):
         self.last_upsert = {
@@ -28,22 +104,36 @@ class FakeVectorStore:
         min_score: float = 0.0,
         enable_hybrid_fallback: bool = True,
     ):
-        self.last_search = {
+        self.last_search = SearchCall(person_id, query, top_k, min_score, enable_hybrid_fallback)
+        return _FAKE_SEARCH_RESULT
+
+    def search_batch(
+        self,
+        person_id: str,
+        queries: list[str],
+        top_k: int = 5,
+        min_score: float = 0.0,
+        enable_hybrid_fallback: bool = True,
+    ):
+        self.search_batch_calls += 1
+        self.last_search_batch = {
             "person_id": person_id,
-            "query": query,
+            "queries": queries,
             "top_k": top_k,
             "min_score": min_score,
-            "enable_hybrid_fallback": enable_hybrid_fallback,
         }
         return [
-            {
-                "id": "vec-1",
-                "score": 0.88,
-                "text": "Use blue-green rollout for production deploys.",
-                "source": "ops/deploy_runbook.md",
-                "metadata": {"person_id": person_id},
-                "retrieval_mode": "vector",
-            }
+            [
+                {
+                    "id": f"vec-{index}",
+                    "score": 0.9,
+                    "text": f"Answer for {query}",
+                    "source": "ops/deploy_runbook.md",
+                    "metadata": {"person_id": person_id},
+                    "retrieval_mode": "vector",
+                }
+            ]
+            for index, query in enumerate(queries)
         ]
 
     def delete_by_source(self, person_id: str, source: str):
@@ -55,61 +145,132 @@ class FakeVectorStore:
         return 2, 4
 
 
-@pytest.mark.asyncio
-async def test_retrieval_index_endpoint(monkeypatch):
+def test_retrieval_index_endpoint(sync_client, dependency_overrides):
     fake_store = FakeVectorStore()
-    monkeypatch.setattr(main_module, "get_vector_store_service", lambda: fake_store)
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post(
-            "/v1/retrieval/index",
-            json={
-                "person_id": "person_x",
-                "source": "manual",
-                "knowledge_text": "Blue-green deploy strategy with two target groups.",
-            },
-        )
+    response = sync_client.post(
+        "/v1/retrieval/index",
+        content=_INDEX_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
 
     assert response.status_code == 200
-    body = response.json()
+    body = jget(response)
     assert body["person_id"] == "person_x"
     assert body["indexed_chunks"] == 3
     assert fake_store.last_upsert is not None
 
 
-@pytest.mark.asyncio
-async def test_retrieval_search_endpoint(monkeypatch):
+def test_retrieval_search_endpoint(sync_client, dependency_overrides):
     fake_store = FakeVectorStore()
-    monkeypatch.setattr(main_module, "get_vector_store_service", lambda: fake_store)
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post(
-            "/v1/retrieval/search",
-            json={
-                "person_id": "person_x",
-                "query": "How do we deploy safely?",
-                "top_k": 4,
-                "min_score": 0.5,
-            },
-        )
+    response = sync_client.post(
+        "/v1/retrieval/search",
+        content=_SEARCH_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
 
     assert response.status_code == 200
-    body = response.json()
+    body = jget(response)
     assert body["person_id"] == "person_x"
     assert len(body["results"]) == 1
     assert body["results"][0]["source"] == "ops/deploy_runbook.md"
     assert body["results"][0]["retrieval_mode"] == "vector"
     assert fake_store.last_search is not None
-    assert fake_store.last_search["top_k"] == 4
-    assert fake_store.last_search["enable_hybrid_fallback"] is True
+    assert fake_store.last_search.person_id == "person_x"
+    assert fake_store.last_search.top_k == 4
+    assert fake_store.last_search.enable_hybrid_fallback is True
+
+
+@pytest.mark.asyncio
+async def test_retrieval_search_endpoint_raw_asgi(dependency_overrides):
+    fake_store = FakeVectorStore()
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
+
+    status, body = await asgi_post(main_module.app, "/v1/retrieval/search", _SEARCH_PAYLOAD)
+
+    assert status == 200
+    assert b'"source":"ops/deploy_runbook.md"' in body
+    assert fake_store.last_search.top_k == 4
+
+
+def test_retrieval_index_and_search_endpoint(sync_client, dependency_overrides):
+    fake_store = FakeVectorStore()
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
+
+    response = sync_client.post(
+        "/v1/retrieval/index_and_search",
+        content=_INDEX_AND_SEARCH_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = jget(response)
+    assert body["indexed_chunks"] == 3
+    assert body["results"][0]["source"] == "ops/deploy_runbook.md"
+    assert fake_store.last_upsert["source"] == "ops/deploy_runbook.md"
+    assert fake_store.last_search.query == "How do we deploy safely?"
+    assert fake_store.last_search.top_k == 3
+
+
+def test_retrieval_index_and_search_ranks_with_numpy_store(sync_client, dependency_overrides):
+    store = NumpyVectorStore()
+    store.upsert_documents("person_y", ["Rollback the deploy first."], source="other")
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: store
+
+    response = sync_client.post(
+        "/v1/retrieval/index_and_search",
+        content=orjson.dumps(
+            {
+                "person_id": "person_x",
+                "source": "runbook",
+                "knowledge_text": (
+                    "Rotate on-call weekly.\n\n"
+                    "Rollback the deploy before debugging.\n\n"
+                    "Budget reviews happen quarterly."
+                ),
+                "query": "rollback deploy",
+                "top_k": 2,
+                "min_score": 0.1,
+            }
+        ),
+        headers=JSON_HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = jget(response)
+    assert body["indexed_chunks"] == 3
+    assert [result["content"] for result in body["results"]] == [
+        "Rollback the deploy before debugging."
+    ]
+    assert store.embeddings.shape == (4, store.dimensions)
+
+
+def test_retrieval_search_batch_endpoint(sync_client, dependency_overrides):
+    fake_store = FakeVectorStore()
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
+
+    response = sync_client.post(
+        "/v1/retrieval/search/batch",
+        content=_SEARCH_BATCH_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = jget(response)
+    assert fake_store.search_batch_calls == 1
+    assert len(fake_store.last_search_batch["queries"]) == 50
+    assert fake_store.last_search_batch["top_k"] == 3
+    assert [item["query"] for item in body["results"]] == _BATCH_QUERIES
+    assert body["results"][7]["results"][0]["content"] == "Answer for deploy question 7"
 
 
 @pytest.mark.asyncio
-async def test_chat_uses_retrieval_when_requested(monkeypatch):
+async def test_chat_uses_retrieval_when_requested(client, dependency_overrides):
     fake_store = FakeVectorStore()
-    monkeypatch.setattr(main_module, "get_vector_store_service", lambda: fake_store)
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
 
     captured = {}
 
@@ -117,63 +278,49 @@ async def test_chat_uses_retrieval_when_requested(monkeypatch):
         captured["prompt"] = prompt
         return "retrieved answer"
 
-    monkeypatch.setattr(main_module, "generate_with_retry", fake_generate_with_retry)
+    dependency_overrides[main_module.get_llm_generator] = lambda: fake_generate_with_retry
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post(
-            "/v1/chat",
-            json={
-                "person_id": "person_x",
-                "message": "How do we deploy safely?",
-                "use_retrieval": True,
-            },
-        )
+    response = await client.post(
+        "/v1/chat",
+        content=_CHAT_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
 
     assert response.status_code == 200
-    body = response.json()
+    body = jget(response)
     assert body["response"] == "retrieved answer"
     assert body["metadata"]["retrieval_used"] is True
     assert body["metadata"]["retrieved_chunks"] == 1
     assert "Retrieved Context:" in captured["prompt"]
 
 
-@pytest.mark.asyncio
-async def test_retrieval_delete_source_endpoint(monkeypatch):
+def test_retrieval_delete_source_endpoint(sync_client, dependency_overrides):
     fake_store = FakeVectorStore()
-    monkeypatch.setattr(main_module, "get_vector_store_service", lambda: fake_store)
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post(
-            "/v1/retrieval/source/delete",
-            json={"person_id": "person_x", "source": "runbook"},
-        )
+    response = sync_client.post(
+        "/v1/retrieval/source/delete",
+        content=_DELETE_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
 
     assert response.status_code == 200
-    body = response.json()
-    assert body["deleted_chunks"] == 2
+    assert jget(response)["deleted_chunks"] == 2
     assert fake_store.last_delete == {"person_id": "person_x", "source": "runbook"}
 
 
-@pytest.mark.asyncio
-async def test_retrieval_replace_source_endpoint(monkeypatch):
+def test_retrieval_replace_source_endpoint(sync_client, dependency_overrides):
     fake_store = FakeVectorStore()
-    monkeypatch.setattr(main_module, "get_vector_store_service", lambda: fake_store)
+    dependency_overrides[main_module.get_vector_store_provider] = lambda: lambda: fake_store
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        response = await client.post(
-            "/v1/retrieval/source/replace",
-            json={
-                "person_id": "person_x",
-                "source": "runbook",
-                "knowledge_text": "Deployment notes",
-            },
-        )
+    response = sync_client.post(
+        "/v1/retrieval/source/replace",
+        content=_REPLACE_PAYLOAD,
+        headers=JSON_HEADERS,
+    )
 
     assert response.status_code == 200
-    body = response.json()
+    body = jget(response)
     assert body["deleted_chunks"] == 2
     assert body["indexed_chunks"] == 4
     assert fake_store.last_replace is not None
@@ -1,11 +1,16 @@
+from uuid import UUID
+
 import pytest
 from pydantic import ValidationError
 
 from src.models.schemas import (
     ChatRequest,
     HealthResponse,
+    KnowledgeEntryCreate,
+    MessageResponse,
     PersonResponse,
     RetrievalIndexRequest,
+    UserCreate,
 )
 
 
@@ -19,6 +24,14 @@ def test_chat_request_rejects_whitespace_message():
         ChatRequest(person_id="person_x", message="   ")
 
 
+def test_whitespace_is_preserved_outside_chat_message():
+    user = UserCreate(email="a@b.c", username="asha", password="  secretpw1  ")
+    entry = KnowledgeEntryCreate(content="    indented code\n", source_type="manual")
+
+    assert user.password == "  secretpw1  "
+    assert entry.content == "    indented code\n"
+
+
 def test_retrieval_index_requires_content():
     with pytest.raises(ValidationError):
         RetrievalIndexRequest(person_id="person_x")
@@ -50,3 +63,38 @@ def test_person_response_accepts_object_attributes():
     parsed = PersonResponse.model_validate(PersonRow())
     assert parsed.id == "abc"
     assert parsed.name == "X"
+
+
+def test_person_response_serializes_uuid_ids_as_strings():
+    row_id = UUID("01890a5d-ac96-774b-bcce-b302099a8057")
+
+    class PersonRow:
+        id = row_id
+        name = "X"
+        role = None
+        department = None
+        base_system_prompt = None
+        communication_style = None
+        is_active = True
+        metadata = None
+        created_at = "2026-02-16T00:00:00Z"
+        updated_at = "2026-02-16T00:00:00Z"
+
+    parsed = PersonResponse.model_validate(PersonRow())
+    assert parsed.id == str(row_id)
+
+
+def test_message_response_is_immutable():
+    message = MessageResponse(
+        id="msg-1",
+        conversation_id="conv-1",
+        role="user",
+        content="hello",
+        model=None,
+        tokens_used=None,
+        confidence_score=None,
+        created_at="2026-02-16T00:00:00Z",
+    )
+
+    with pytest.raises(ValidationError):
+        message.content = "edited"
@@ -0,0 +1,391 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from config.settings import Settings
+from src.services.vector_store import VectorStoreService, _QueryEmbedBatcher, _onnx_cache_dir
+
+
+class FakeEmbedder:
+    """Deterministic embedder: each text maps to a one-hot-ish vector keyed by its length."""
+
+    dimensions = 8
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.batch_sizes: list[int] = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        self.batch_sizes.append(kwargs.get("batch_size"))
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row, len(text) % self.dimensions] = 1.0
+        return vectors
+
+
+class FakeSplitter:
+    def split_text(self, text):
+        return text.split("\n\n")
+
+
+class FakeAsyncResult:
+    def __init__(self, index, error=None):
+        self._index = index
+        self._error = error
+
+    def get(self):
+        self._index.completed += 1
+        if self._error is not None:
+            raise self._error
+
+
+class FakeIndex:
+    def __init__(self):
+        self.upserts: list[list[dict]] = []
+        self.matches: list[dict] = []
+        self.completed = 0
+        # Upsert call number -> error raised when that batch's result is awaited.
+        self.upsert_errors: dict[int, Exception] = {}
+        self.supports_filter_delete = True
+        self.deleted_ids = None
+        self.query_error = None
+        self.last_query = None
+
+    def upsert(self, vectors, async_req=False):
+        self.upserts.append(vectors)
+        return FakeAsyncResult(self, self.upsert_errors.get(len(self.upserts) - 1))
+
+    def query(self, **kwargs):
+        self.last_query = kwargs
+        if self.query_error is not None:
+            raise self.query_error
+        return {"matches": self.matches}
+
+    def delete(self, ids=None, filter=None):
+        if filter is not None and not self.supports_filter_delete:
+            raise TypeError("filter delete unsupported")
+        self.deleted_ids = ids
+
+
+def make_service(**settings_overrides) -> VectorStoreService:
+    service = VectorStoreService.__new__(VectorStoreService)
+    service._settings = Settings(**settings_overrides)
+    service._embedder = FakeEmbedder()
+    service._splitter = FakeSplitter()
+    service._index = FakeIndex()
+    service._init_local_caches()
+    return service
+
+
+def test_embed_passes_inputs_through_in_caller_order():
+    service = make_service(embedding_batch_size=32)
+
+    vectors = service._embed(["ccc", "a", "bb"])
+
+    assert service._embedder.calls == [["ccc", "a", "bb"]]
+    assert service._embedder.batch_sizes == [32]
+    assert [int(np.argmax(row)) for row in vectors] == [3, 1, 2]
+
+
+def test_embed_returns_float32_matrix():
+    vectors = make_service()._embed(["a", "bb"])
+
+    assert isinstance(vectors, np.ndarray)
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (2, FakeEmbedder.dimensions)
+
+
+def test_upsert_documents_sends_plain_float_lists():
+    service = make_service(pinecone_compress_text=False)
+
+    indexed = service.upsert_documents(
+        "person_x", ["first chunk\n\nsecond chunk"], source="runbook"
+    )
+
+    assert indexed == 2
+    payload = service._index.upserts[0]
+    assert [item["metadata"]["text"] for item in payload] == ["first chunk", "second chunk"]
+    assert all(type(value) is float for value in payload[0]["values"])
+
+
+def test_upsert_documents_dispatches_batches_per_window():
+    service = make_service(pinecone_upsert_batch_size=2, pinecone_document_chunk_size=3)
+    documents = ["\n\n".join(f"chunk {i}" for i in range(5))]
+
+    indexed = service.upsert_documents("person_x", documents)
+
+    assert indexed == 5
+    assert [len(batch) for batch in service._index.upserts] == [2, 1, 2]
+    assert service._index.completed == 3
+    assert service._embedder.calls == [
+        ["chunk 0", "chunk 1", "chunk 2"],
+        ["chunk 3", "chunk 4"],
+    ]
+    chunk_indexes = [
+        item["metadata"]["chunk_index"] for batch in service._index.upserts for item in batch
+    ]
+    assert chunk_indexes == [1, 2, 3, 4, 5]
+
+
+def test_upsert_documents_awaits_every_batch_and_caches_only_confirmed_windows():
+    service = make_service(pinecone_upsert_batch_size=2, pinecone_document_chunk_size=2)
+    service._index.upsert_errors[1] = ConnectionError("batch lost")
+    documents = ["\n\n".join(f"chunk {i}" for i in range(6))]
+
+    with pytest.raises(ConnectionError):
+        service.upsert_documents("person_x", documents, source="runbook")
+
+    assert service._index.completed == 3
+    cached = [item["text"] for item in service._local_index["person_x"][0]]
+    assert cached == ["chunk 0", "chunk 1", "chunk 4", "chunk 5"]
+    assert service._local_index["person_x"][1].shape == (4, FakeEmbedder.dimensions)
+    written_ids = [
+        item["id"] for position in (0, 2) for item in service._index.upserts[position]
+    ]
+    assert service._source_vector_ids[("person_x", "runbook")] == bytes.fromhex(
+        "".join(written_ids)
+    )
+
+
+def test_upsert_documents_skips_blank_chunks_and_documents():
+    service = make_service(pinecone_compress_text=False)
+
+    assert service.upsert_documents("person_x", ["", "   ", "\n\n"]) == 0
+    assert service.upsert_documents("person_x", ["  alpha  \n\n \n\nbeta"]) == 2
+    assert [item["metadata"]["text"] for item in service._index.upserts[0]] == ["alpha", "beta"]
+    assert service._index.upserts[0][1]["metadata"]["chunk_index"] == 2
+
+
+def test_compressed_chunk_text_round_trips_through_search():
+    service = make_service(pinecone_compress_text=True)
+    text = "rollback first, then page the on-call " * 20
+
+    service.upsert_documents("person_x", [text], source="runbook")
+
+    wire_metadata = service._index.upserts[0][0]["metadata"]
+    assert "text" not in wire_metadata
+    assert len(wire_metadata["text_z"]) < len(text)
+    assert service._local_index["person_x"][0][0]["text"] == text.strip()
+
+    service._index.matches = [{"id": "vec-1", "score": 0.9, "metadata": wire_metadata}]
+    [result] = service.search("person_x", "rollback")
+
+    assert result["text"] == text.strip()
+    assert "text_z" not in result["metadata"]
+
+
+def test_compression_keeps_plain_text_when_packing_would_grow_it():
+    service = make_service(pinecone_compress_text=True)
+
+    service.upsert_documents("person_x", ["Roll back first."], source="runbook")
+
+    wire_metadata = service._index.upserts[0][0]["metadata"]
+    assert wire_metadata["text"] == "Roll back first."
+    assert "text_z" not in wire_metadata
+
+
+def test_vector_fallback_ranks_cached_embeddings_when_pinecone_fails():
+    service = make_service()
+    service.upsert_documents("person_x", ["abc\n\nabcd\n\nabcdefgh"], source="runbook")
+    service.upsert_documents("person_x", ["wxyz"], source="notes")
+    service._index.query_error = ConnectionError("pinecone unavailable")
+
+    results = service.search("person_x", "1234", top_k=2, min_score=0.5)
+
+    assert [result["text"] for result in results] == ["abcd", "wxyz"]
+    assert all(result["retrieval_mode"] == "vector_fallback" for result in results)
+    assert results[0]["score"] == 1.0
+
+    service.delete_by_source("person_x", "runbook")
+
+    assert service._local_index["person_x"][1].shape == (1, FakeEmbedder.dimensions)
+    assert [result["text"] for result in service.search("person_x", "1234")] == ["wxyz"]
+
+
+class FakeApiError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"status {status}")
+        self.status = status
+
+
+def test_query_falls_back_only_on_transient_pinecone_errors():
+    service = make_service()
+    service.upsert_documents("person_x", ["abcd"], source="runbook")
+
+    service._index.query_error = FakeApiError(503)
+    assert [result["text"] for result in service.search("person_x", "1234")] == ["abcd"]
+
+    for error in (FakeApiError(401), ValueError("bad filter")):
+        service._index.query_error = error
+        with pytest.raises(type(error)):
+            service.search("person_x", "wxyz")
+
+
+def test_concurrent_upserts_and_fallback_searches_keep_rows_aligned():
+    service = make_service()
+    service._index.query_error = ConnectionError("pinecone unavailable")
+    document = "\n\n".join("x" * length for length in range(1, 9))
+
+    def write(worker):
+        for round_number in range(20):
+            source = f"worker-{worker}-{round_number}"
+            service.upsert_documents("person_x", [document], source=source)
+            if round_number % 2:
+                service.delete_by_source("person_x", source)
+
+    def read(worker):
+        for round_number in range(40):
+            length = (worker + round_number) % 8 + 1
+            results = service.search("person_x", "q" * length, top_k=3, min_score=0.5)
+            # A misaligned row would surface a chunk whose length hashes elsewhere.
+            assert all(len(result["text"]) % 8 == length % 8 for result in results)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(write, worker) for worker in range(4)]
+        futures += [pool.submit(read, worker) for worker in range(4)]
+        for future in futures:
+            future.result()
+
+    entries, vectors = service._local_index["person_x"]
+    assert len(entries) == vectors.shape[0] == 4 * 10 * 8
+    assert len(service._source_vector_ids) == 4 * 10
+
+
+def test_search_batch_embeds_unique_queries_once():
+    service = make_service()
+    service._index.matches = [{"id": "vec-1", "score": 0.9, "metadata": {"text": "t"}}]
+
+    results = service.search_batch("person_x", ["deploy", "rollback", "deploy"], top_k=1)
+
+    assert service._embedder.calls == [["deploy", "rollback"]]
+    assert [[match["id"] for match in matches] for matches in results] == [["vec-1"]] * 3
+
+
+def test_search_reuses_cached_query_embedding():
+    service = make_service()
+    service._index.matches = [
+        {"id": "vec-1", "score": 0.9, "metadata": {"text": "Roll back first.", "source": "ops"}}
+    ]
+
+    first = service.search("person_x", "rollback?")
+    second = service.search("person_x", "rollback?")
+
+    assert first == second
+    assert first[0]["retrieval_mode"] == "vector"
+    assert service._embedder.calls == [["rollback?"]]
+    assert not service._query_vectors["rollback?"].flags.writeable
+    assert type(service._index.last_query["vector"][0]) is float
+
+
+def test_search_batch_shares_query_embedding_cache_with_search():
+    service = make_service()
+    service._index.matches = [{"id": "vec-1", "score": 0.9, "metadata": {"text": "t"}}]
+
+    service.search("person_x", "deploy")
+    service.search_batch("person_x", ["deploy", "rollback"])
+    service.search("person_x", "rollback")
+
+    assert service._embedder.calls == [["deploy"], ["rollback"]]
+
+
+def test_query_embedding_cache_evicts_least_recently_used():
+    service = make_service(query_embed_cache_size=2)
+
+    service.search_batch("person_x", ["a", "b"])
+    service.search("person_x", "a")
+    service.search("person_x", "c")
+
+    assert list(service._query_vectors) == ["a", "c"]
+
+
+def test_keyword_fallback_matches_whole_tokens():
+    service = make_service()
+    service.upsert_documents(
+        "person_x",
+        ["Rollback first during incidents.\n\nBlue-green deploys reduce blast radius."],
+        source="runbook",
+    )
+
+    # No cached embedding clears min_score, so the lexical fallback answers.
+    results = service.search(
+        "person_x", "What about rollback?", min_score=0.5, enable_hybrid_fallback=True
+    )
+
+    assert [result["text"] for result in results] == ["Rollback first during incidents."]
+    assert results[0]["retrieval_mode"] == "keyword_fallback"
+    assert results[0]["score"] == 1 / 3
+
+
+def test_search_returns_top_k_by_score():
+    service = make_service()
+    service._index.matches = [
+        {"id": f"vec-{score}", "score": score, "metadata": {"text": "t"}}
+        for score in (0.3, 0.9, 0.5, 0.7)
+    ]
+
+    results = service.search("person_x", "deploy", top_k=2)
+
+    assert [result["id"] for result in results] == ["vec-0.9", "vec-0.7"]
+
+
+def test_delete_by_source_falls_back_to_packed_ids():
+    service = make_service()
+    service._index.supports_filter_delete = False
+    service.upsert_documents("person_x", ["one\n\ntwo"], source="runbook")
+    service.upsert_documents("person_x", ["three"], source="other")
+    upserted_ids = [item["id"] for item in service._index.upserts[0]]
+
+    deleted = service.delete_by_source("person_x", "runbook")
+
+    assert deleted == 2
+    assert service._index.deleted_ids == upserted_ids
+    assert [item["text"] for item in service._local_index["person_x"][0]] == ["three"]
+    assert ("person_x", "runbook") not in service._source_vector_ids
+
+
+def test_shared_resources_are_built_once_per_key():
+    built = []
+
+    def factory():
+        built.append(object())
+        return built[-1]
+
+    first = VectorStoreService._get_shared(("test-resource", 1), factory)
+    second = VectorStoreService._get_shared(("test-resource", 1), factory)
+    other = VectorStoreService._get_shared(("test-resource", 2), factory)
+
+    assert first is second
+    assert other is not first
+    assert len(built) == 2
+
+    VectorStoreService._shared_resources.pop(("test-resource", 1))
+    VectorStoreService._shared_resources.pop(("test-resource", 2))
+
+
+def test_query_batcher_coalesces_concurrent_queries():
+    service = make_service()
+    batcher = _QueryEmbedBatcher(service._embed, max_batch=8, max_wait_seconds=0.5)
+    queries = ["a", "bb", "ccc", "dddd"]
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        vectors = list(pool.map(batcher.embed, queries))
+
+    assert len(service._embedder.calls) == 1
+    assert sorted(service._embedder.calls[0]) == queries
+    assert [int(np.argmax(vector)) for vector in vectors] == [1, 2, 3, 4]
+
+
+def test_onnx_cache_dir_is_per_model_and_anchored_to_project_root():
+    mini = Settings(embedding_model="sentence-transformers/all-MiniLM-L6-v2")
+    mpnet = Settings(embedding_model="sentence-transformers/all-mpnet-base-v2")
+
+    mini_dir = Path(_onnx_cache_dir(mini))
+
+    assert mini_dir.is_absolute()
+    assert mini_dir.parent.name == "embedding-onnx"
+    assert mini_dir.name.startswith("sentence-transformers--all-MiniLM-L6-v2-")
+    assert _onnx_cache_dir(mpnet) != str(mini_dir)
+    assert _onnx_cache_dir(Settings(embedding_onnx_cache_dir="")) is None
@@ -0,0 +1,55 @@
+"""Shared helpers for HTTP-level tests."""
+from typing import Any
+
+import orjson
+
+
+def jget(response) -> Any:
+    """Decode a response body with orjson, skipping httpx's content-type negotiation."""
+    return orjson.loads(response.content)
+
+
+async def asgi_post(app, path: str, body: bytes) -> tuple[int, bytes]:
+    """POST a JSON body straight through the ASGI interface and return (status, body).
+
+    Skips httpx request/response construction for tests that only check the status
+    code and a few bytes of the payload. The app lifespan is not started.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"test"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 123),
+        "server": ("test", 80),
+    }
+    request_sent = False
+    status = 0
+    chunks: list[bytes] = []
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)